@@ -6,6 +6,7 @@ Provides endpoints for employee list, search, and individual employee data.
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File
 from pathlib import Path
 import json
+import zipfile
 from typing import Optional
 
 router = APIRouter(prefix="/api/comparison", tags=["comparison"])
@@ -13,6 +14,66 @@ router = APIRouter(prefix="/api/comparison", tags=["comparison"])
 # Configuration
 JSON_DIR = Path('data/json')
 
+# index.json contents, reloaded only when the file changes on disk
+_index_cache = {'stamp': None, 'employees': [], 'search_keys': []}
+
+
+def _load_index() -> list:
+    """
+    Return the employee index, reading index.json only when it has changed.
+    
+    Also refreshes the lowercased search keys used by /search.
+    """
+    index_file = JSON_DIR / 'index.json'
+    stat = index_file.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    
+    if _index_cache['stamp'] != stamp:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            employees = json.load(f)
+        # NUL separator keeps a query from matching across two fields
+        _index_cache['search_keys'] = [
+            f"{emp['name']}\0{emp['ecc_pernr']}\0{emp['ecp_pernr']}".lower()
+            for emp in employees
+        ]
+        _index_cache['employees'] = employees
+        _index_cache['stamp'] = stamp
+    
+    return _index_cache['employees']
+
+
+# Open handle on bundle.zip, reopened only when the archive is replaced
+_bundle_cache = {'stamp': None, 'zip': None}
+
+
+def _read_employee_json(pernr: str) -> Optional[bytes]:
+    """
+    Return the raw JSON for one employee, or None if it does not exist.
+    
+    Reads from bundle.zip written by convert_to_json.py. Loose {pernr}.json
+    files from older conversions are only used when there is no bundle, so
+    leftovers from an earlier run are never served as current data.
+    """
+    bundle_file = JSON_DIR / 'bundle.zip'
+    if bundle_file.exists():
+        stat = bundle_file.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if _bundle_cache['stamp'] != stamp:
+            if _bundle_cache['zip'] is not None:
+                _bundle_cache['zip'].close()
+            _bundle_cache['zip'] = zipfile.ZipFile(bundle_file)
+            _bundle_cache['stamp'] = stamp
+        try:
+            return _bundle_cache['zip'].read(f'{pernr}.json')
+        except KeyError:
+            return None
+    
+    json_file = JSON_DIR / f'{pernr}.json'
+    if json_file.is_file():
+        return json_file.read_bytes()
+    
+    return None
+
 
 @router.get("/employees")
 async def get_employees(
@@ -21,10 +82,8 @@ async def get_employees(
 ):
     """Get list of all employees with pagination."""
     try:
-        # Load index
-        index_file = JSON_DIR / 'index.json'
-        with open(index_file, 'r', encoding='utf-8') as f:
-            employees = json.load(f)
+        # Load index (cached until index.json changes)
+        employees = _load_index()
         
         # Pagination
         start = (page - 1) * per_page
@@ -51,18 +110,14 @@ async def search_employees(
     try:
         query = q.strip().lower()
         
-        # Load index
-        index_file = JSON_DIR / 'index.json'
-        with open(index_file, 'r', encoding='utf-8') as f:
-            employees = json.load(f)
+        # Load index (cached until index.json changes)
+        employees = _load_index()
         
         # Search by name, ECC PERNR, or ECP PERNR
-        results = []
-        for emp in employees:
-            if (query in emp['name'].lower() or 
-                query in emp['ecc_pernr'].lower() or 
-                query in emp['ecp_pernr'].lower()):
-                results.append(emp)
+        results = [
+            emp for emp, key in zip(employees, _index_cache['search_keys'])
+            if query in key
+        ]
         
         return {
             'query': query,
@@ -78,15 +133,12 @@ async def search_employees(
 async def get_employee(pernr: str):
     """Get detailed data for a specific employee."""
     try:
-        json_file = JSON_DIR / f'{pernr}.json'
+        raw = _read_employee_json(pernr)
         
-        if not json_file.exists():
+        if raw is None:
             raise HTTPException(status_code=404, detail='Employee not found')
         
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        return data
+        return json.loads(raw)
     
     except HTTPException:
         raise
@@ -129,9 +181,7 @@ async def upload_comparison(file: UploadFile = File(...)):
 async def get_stats():
     """Get statistics about the dataset."""
     try:
-        index_file = JSON_DIR / 'index.json'
-        with open(index_file, 'r', encoding='utf-8') as f:
-            employees = json.load(f)
+        employees = _load_index()
         
         total_employees = len(employees)
         total_entries = sum(emp['total_entries'] for emp in employees)
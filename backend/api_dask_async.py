@@ -3,6 +3,8 @@ Async comparison API endpoints with background job processing.
 Uses DuckDB for fast queries on comparison results.
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
@@ -51,15 +53,18 @@ async def start_comparison(
         }
     """
     try:
-        # Create job first
-        job_id = job_manager.create_job(request.ecc_dataset, request.ecp_dataset)
+        # Create job first (writes the job file off the event loop)
+        job_id = await asyncio.to_thread(
+            job_manager.create_job, request.ecc_dataset, request.ecp_dataset
+        )
         
         # Start comparison in background with the job_id
-        def run_comparison():
+        async def run_comparison():
             print(f"[DEBUG] Background task started for job {job_id}")
             try:
                 print(f"[DEBUG] Starting comparison: {request.ecc_dataset} vs {request.ecp_dataset}")
-                comparator.compare_datasets_async(
+                await asyncio.to_thread(
+                    comparator.compare_datasets_async,
                     ecc_dataset=request.ecc_dataset,
                     ecp_dataset=request.ecp_dataset,
                     job_id=job_id
@@ -70,7 +75,7 @@ async def start_comparison(
                 import traceback
                 traceback.print_exc()
                 # Update job with error
-                job_manager.update_job(
+                await job_manager.update_job_async(
                     job_id=job_id,
                     status=JobStatus.FAILED,
                     progress_message=f"Error: {str(e)}"
@@ -228,7 +233,7 @@ async def list_jobs(limit: int = Query(50, ge=1, le=200, description="Maximum jo
             "count": 50
         }
     """
-    jobs = job_manager.list_jobs(limit=limit)
+    jobs = await asyncio.to_thread(job_manager.list_jobs, limit=limit)
     
     return {
         "jobs": jobs,
@@ -106,6 +106,7 @@ async def stop_cluster():
     """Stop the Dask cluster."""
     try:
         dask_comparator.stop_cluster()
+        dask_comparator.close_client()
         return {'status': 'stopped'}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to stop cluster: {str(e)}")
@@ -3,12 +3,14 @@ Dask-based comparison logic for large-scale ECC vs ECP data files.
 Optimized for memory efficiency and parallel processing.
 """
 
+import atexit
 import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import pandas as pd
+import dask
 import dask.dataframe as dd
-from dask.distributed import Client, LocalCluster
+from dask.distributed import Client, LocalCluster, wait
 from dask import delayed
 import numpy as np
 
@@ -16,6 +18,9 @@ import numpy as np
 class DaskDataComparator:
     """Compare two large datasets using Dask for parallel processing."""
     
+    # Shared by all instances so repeated comparisons reuse the same workers
+    _client: Optional[Client] = None
+    
     def __init__(self, data_dir: Path = None, mappings_dir: Path = None, n_workers: int = 4):
         """Initialize Dask comparator with data and mappings directories."""
         if data_dir is None:
@@ -29,19 +34,38 @@ class DaskDataComparator:
         self.client = None
         self.mappings_cache = {}
         
+    @classmethod
+    def get_client(cls, n_workers: int = 4) -> Client:
+        """
+        Return the process-wide Dask client, starting a local cluster on first use.
+        
+        The cluster is closed at interpreter exit (or via close_client).
+        """
+        if cls._client is None or cls._client.status == 'closed':
+            cluster = LocalCluster(n_workers=n_workers, threads_per_worker=2, memory_limit='2GB')
+            cls._client = Client(cluster)
+            print(f"Dask cluster started: {cls._client.dashboard_link}")
+        return cls._client
+    
+    @classmethod
+    def close_client(cls):
+        """Shut down the shared Dask client and its local cluster."""
+        client, cls._client = cls._client, None
+        if client is not None:
+            cluster = client.cluster
+            client.close()
+            if cluster is not None:
+                cluster.close()
+    
     def start_cluster(self):
-        """Start Dask local cluster for parallel processing."""
-        if self.client is None:
-            cluster = LocalCluster(n_workers=self.n_workers, threads_per_worker=2, memory_limit='2GB')
-            self.client = Client(cluster)
-            print(f"Dask cluster started: {self.client.dashboard_link}")
+        """Attach to the shared Dask cluster, starting it if needed."""
+        if self.client is None or self.client.status == 'closed':
+            self.client = self.get_client(self.n_workers)
         return self.client
     
     def stop_cluster(self):
-        """Stop Dask cluster."""
-        if self.client:
-            self.client.close()
-            self.client = None
+        """Detach from the shared Dask cluster; it keeps running for other callers."""
+        self.client = None
     
     def load_mappings(self) -> tuple[pd.DataFrame, pd.DataFrame]:
         """Load employee and wage type mappings from Excel files."""
@@ -201,16 +225,32 @@ class DaskDataComparator:
             
             merged = merged.assign(status=merged.apply(determine_status, axis=1, meta=('status', 'object')))
             
-            # Compute summary statistics
+            # Materialize the merged result once in worker memory; the summary
+            # and the sorted results below read from it instead of re-running
+            # the load/aggregate/merge graph for every value
+            merged = self.client.persist(merged)
+            wait(merged)
+            
+            # Compute summary statistics in a single pass
             print("Computing summary...")
+            (total_rows, total_ecc, total_ecp, total_diff,
+             matched, ecc_only, ecp_only) = dask.compute(
+                merged.shape[0],
+                merged['ecc_amount'].sum(),
+                merged['ecp_amount'].sum(),
+                merged['difference'].sum(),
+                (merged['status'] == 'Matched').sum(),
+                (merged['status'] == 'ECC Only').sum(),
+                (merged['status'] == 'ECP Only').sum()
+            )
             summary_stats = {
-                'total_rows': int(merged.shape[0].compute()),
-                'total_ecc_amount': float(merged['ecc_amount'].sum().compute()),
-                'total_ecp_amount': float(merged['ecp_amount'].sum().compute()),
-                'total_difference': float(merged['difference'].sum().compute()),
-                'matched_count': int((merged['status'] == 'Matched').sum().compute()),
-                'ecc_only_count': int((merged['status'] == 'ECC Only').sum().compute()),
-                'ecp_only_count': int((merged['status'] == 'ECP Only').sum().compute())
+                'total_rows': int(total_rows),
+                'total_ecc_amount': float(total_ecc),
+                'total_ecp_amount': float(total_ecp),
+                'total_difference': float(total_diff),
+                'matched_count': int(matched),
+                'ecc_only_count': int(ecc_only),
+                'ecp_only_count': int(ecp_only)
             }
             
             # Sort by absolute difference (largest first)
@@ -306,5 +346,9 @@ class DaskDataComparator:
             pass
     
     def __del__(self):
-        """Cleanup: close Dask cluster on deletion."""
+        """Cleanup: release the shared Dask cluster on deletion."""
         self.stop_cluster()
+
+
+# Registered once: close_client is a no-op when no cluster is running
+atexit.register(DaskDataComparator.close_client)
@@ -4,32 +4,261 @@ Utility to encode "Last name First name" column in TXT files for testing purpose
 Supports multiple encoding strategies: hash, sequential IDs, or anonymization.
 """
 import argparse
+import codecs
 import hashlib
+import mmap
+import os
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Callable
+from typing import Dict, Callable, Iterable, List, Optional, Tuple, TextIO, BinaryIO
+
+try:
+    import xxhash
+except ImportError:  # only needed for --hash-algo xxh3
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:  # only needed for --hash-algo blake3
+    blake3 = None
+
+# Hash algorithms for the 'hash' method; sha256 is the cryptographic opt-in
+HASH_ALGORITHMS = ('xxh3', 'blake3', 'sha256')
+
+# Encodings where the delimiter and newline bytes never occur inside a
+# multi-byte character, so lines can be sliced straight out of the raw bytes
+_BYTE_SAFE_ENCODINGS = {'utf-8', 'ascii', 'iso8859-1', 'cp1252'}
+
+# Bytes scanned per block on the mmap path
+_BLOCK_SIZE = 1 << 20
+
+
+def _get_hexdigest(hash_algo: str) -> Callable[[bytes], str]:
+    """Return a bytes -> hex digest function for the given hash algorithm."""
+    if hash_algo == 'sha256':
+        return lambda data: hashlib.sha256(data).hexdigest()
+    if hash_algo == 'xxh3':
+        if xxhash is None:
+            raise ImportError("xxhash is required for --hash-algo xxh3 (pip install xxhash)")
+        return xxhash.xxh3_64_hexdigest
+    if hash_algo == 'blake3':
+        if blake3 is None:
+            raise ImportError("blake3 is required for --hash-algo blake3 (pip install blake3)")
+        return lambda data: blake3.blake3(data).hexdigest()
+    raise ValueError(
+        f"Unknown hash algorithm '{hash_algo}'. Choose from: {', '.join(HASH_ALGORITHMS)}"
+    )
+
+
+def _encode_lines(
+    lines: Iterable[str],
+    outfile: TextIO,
+    name_col_idx: int,
+    delimiter: str,
+    encoder_func: Callable[[str], str]
+) -> Tuple[int, int]:
+    """Encode the name column of each data line and write it to outfile."""
+    total_rows = 0
+    encoded_count = 0
+    
+    for line in lines:
+        # isspace() answers "blank?" without copying the line like strip() would
+        if not line.isspace():
+            fields = line.split(delimiter)
+            
+            # Encode the name field
+            if name_col_idx < len(fields):
+                name_field = fields[name_col_idx]
+                original_name = name_field.strip()
+                if original_name:
+                    fields[name_col_idx] = encoder_func(original_name)
+                    # A name in the last column carries the line's newline
+                    if name_field.endswith('\n'):
+                        fields[name_col_idx] += '\n'
+                    encoded_count += 1
+            
+            outfile.write(delimiter.join(fields))
+            total_rows += 1
+    
+    return total_rows, encoded_count
+
+
+def _iter_blocks(buf: mmap.mmap, start: int, end: int):
+    """Yield (block_start, block_end) windows of buf[start:end] that end after a newline."""
+    while start < end:
+        block_end = min(start + _BLOCK_SIZE, end)
+        if block_end < end:
+            newline_pos = buf.rfind(b'\n', start, block_end)
+            if newline_pos == -1:
+                # Line longer than a block: extend to its end
+                newline_pos = buf.find(b'\n', block_end, end)
+            block_end = end if newline_pos == -1 else newline_pos + 1
+        yield start, block_end
+        start = block_end
+
+
+def _encode_buffer(
+    buf: mmap.mmap,
+    start: int,
+    end: int,
+    outfile: BinaryIO,
+    name_col_idx: int,
+    delimiter: str,
+    encoding: str,
+    encoder_func: Callable[[str], str]
+) -> Tuple[int, int]:
+    """
+    Encode the name column of the lines in buf[start:end] and write them to outfile.
+    
+    Lines stay as bytes; only the name field is decoded. Splitting stops after
+    the name column, so the rest of the row is carried through untouched. The
+    range is walked in newline-aligned blocks: each block is split into lines
+    in one call and written back with one write.
+    """
+    delim_b = delimiter.encode(encoding)
+    max_split = name_col_idx + 1
+    write = outfile.write
+    total_rows = 0
+    encoded_count = 0
+    
+    for block_start, block_end in _iter_blocks(buf, start, end):
+        lines = buf[block_start:block_end].split(b'\n')
+        # The last piece has no newline after it: b'' unless the input ends mid-line
+        tail = lines[-1]
+        tail_kept = bool(tail) and not tail.isspace()
+        out = []
+        append = out.append
+        
+        for line in lines:
+            if not line or line.isspace():
+                continue
+            if line.endswith(b'\r'):
+                line = line[:-1]
+            
+            fields = line.split(delim_b, max_split)
+            if name_col_idx < len(fields):
+                original_name = fields[name_col_idx].decode(encoding).strip()
+                if original_name:
+                    fields[name_col_idx] = encoder_func(original_name).encode(encoding)
+                    encoded_count += 1
+            
+            append(delim_b.join(fields))
+        
+        total_rows += len(out)
+        if out and not tail_kept:
+            append(b'')
+        write(b'\n'.join(out))
+    
+    return total_rows, encoded_count
+
+
+def _collect_names(
+    buf: mmap.mmap,
+    start: int,
+    end: int,
+    name_col_idx: int,
+    delimiter: str,
+    encoding: str
+) -> Dict[str, None]:
+    """Collect unique non-empty names in buf[start:end] in order of first appearance."""
+    delim_b = delimiter.encode(encoding)
+    max_split = name_col_idx + 1
+    names: Dict[str, None] = {}
+    
+    for block_start, block_end in _iter_blocks(buf, start, end):
+        for line in buf[block_start:block_end].split(b'\n'):
+            fields = line.split(delim_b, max_split)
+            if name_col_idx < len(fields):
+                name = fields[name_col_idx].decode(encoding).strip()
+                if name:
+                    names[name] = None
+    
+    return names
+
+
+def _split_ranges(input_file: Path, start: int, workers: int) -> List[Tuple[int, int]]:
+    """Split input_file[start:] into byte ranges that end on line boundaries."""
+    size = os.path.getsize(input_file)
+    step = max(1, (size - start) // workers)
+    bounds = [start]
+    
+    with open(input_file, 'rb') as f:
+        for i in range(1, workers):
+            f.seek(start + i * step - 1)
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _encode_range(
+    input_path: str,
+    part_path: str,
+    start: int,
+    end: int,
+    name_col_idx: int,
+    delimiter: str,
+    encoding: str,
+    name_map: Dict[str, str]
+) -> Tuple[int, int]:
+    """Worker: encode one byte range of the input using a prebuilt name mapping."""
+    with open(input_path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(part_path, 'wb') as outfile:
+        return _encode_buffer(
+            mm, start, end, outfile, name_col_idx, delimiter, encoding, name_map.__getitem__
+        )
 
 
 class NameEncoder:
     """Encodes names in tab-separated TXT files."""
     
-    def __init__(self, encoding_method: str = "hash"):
+    # ID templates for the counter-based methods
+    _ID_FORMATS = {
+        'sequential': "USER_{:04d}",
+        'simple': "EMP_{:05d}",
+    }
+    
+    def __init__(self, encoding_method: str = "hash", hash_algo: str = "xxh3"):
         """
         Initialize encoder.
         
         Args:
             encoding_method: 'hash', 'sequential', or 'faker'
+            hash_algo: Hash for the 'hash' method: 'xxh3', 'blake3' or 'sha256'
         """
+        if hash_algo not in HASH_ALGORITHMS:
+            raise ValueError(
+                f"Unknown hash algorithm '{hash_algo}'. Choose from: {', '.join(HASH_ALGORITHMS)}"
+            )
+        
         self.encoding_method = encoding_method
+        self.hash_algo = hash_algo
+        self._hexdigest: Optional[Callable[[bytes], str]] = None
         self.name_map: Dict[str, str] = {}
+        self._hash_cache: Dict[str, str] = {}
         self.counter = 1
         
     def encode_hash(self, name: str) -> str:
-        """Encode name using SHA256 hash (first 8 characters)."""
+        """Encode name using the configured hash algorithm (first 8 hex characters)."""
         if not name or name.strip() == "":
             return name
-        hash_obj = hashlib.sha256(name.encode('utf-8'))
-        return f"USER_{hash_obj.hexdigest()[:8].upper()}"
+        
+        # Each unique name is hashed once; repeats are a dict hit
+        encoded = self._hash_cache.get(name)
+        if encoded is None:
+            if self._hexdigest is None:
+                self._hexdigest = _get_hexdigest(self.hash_algo)
+            encoded = f"USER_{self._hexdigest(name.encode('utf-8'))[:8].upper()}"
+            self._hash_cache[name] = encoded
+        return encoded
     
     def encode_sequential(self, name: str) -> str:
         """Encode name with sequential IDs (USER_0001, USER_0002, etc.)."""
@@ -37,7 +266,7 @@ class NameEncoder:
             return name
         
         if name not in self.name_map:
-            self.name_map[name] = f"USER_{self.counter:04d}"
+            self.name_map[name] = self._ID_FORMATS['sequential'].format(self.counter)
             self.counter += 1
         return self.name_map[name]
     
@@ -47,7 +276,7 @@ class NameEncoder:
             return name
         
         if name not in self.name_map:
-            self.name_map[name] = f"EMP_{self.counter:05d}"
+            self.name_map[name] = self._ID_FORMATS['simple'].format(self.counter)
             self.counter += 1
         return self.name_map[name]
     
@@ -60,13 +289,85 @@ class NameEncoder:
         }
         return encoders.get(self.encoding_method, self.encode_hash)
     
+    def _row_encoder(self) -> Callable[[str], str]:
+        """
+        Build the encoder used in the per-row loop.
+        
+        Same results as get_encoder(), but the cache, its get method and the
+        hash function are bound as closure locals, so a repeated name costs one
+        local dict lookup instead of a method call plus attribute probes.
+        Callers must pass non-blank, stripped names.
+        """
+        id_format = self._ID_FORMATS.get(self.encoding_method)
+        
+        if id_format is not None:
+            name_map = self.name_map
+            
+            def encode(name: str, _get=name_map.get) -> str:
+                encoded = _get(name)
+                if encoded is None:
+                    encoded = id_format.format(self.counter)
+                    self.counter += 1
+                    name_map[name] = encoded
+                return encoded
+            
+            return encode
+        
+        if self._hexdigest is None:
+            self._hexdigest = _get_hexdigest(self.hash_algo)
+        cache = self._hash_cache
+        hexdigest = self._hexdigest
+        
+        def encode(name: str, _get=cache.get) -> str:
+            encoded = _get(name)
+            if encoded is None:
+                encoded = "USER_" + hexdigest(name.encode('utf-8'))[:8].upper()
+                cache[name] = encoded
+            return encoded
+        
+        return encode
+    
+    def encode_all(self, names: Dict[str, None]) -> Dict[str, str]:
+        """
+        Encode a batch of unique names, keeping their order.
+        
+        The result is allocated at full size with dict.fromkeys on the (already
+        sized) names dict and filled in place, then merged into the encoder's
+        mapping with one update, so neither table rehashes while growing.
+        
+        Args:
+            names: Unique names in first-appearance order (dict keys)
+            
+        Returns:
+            Mapping of original name to encoded name
+        """
+        encoded: Dict[str, str] = dict.fromkeys(names)
+        
+        id_format = self._ID_FORMATS.get(self.encoding_method)
+        if id_format is not None:
+            name_map = self.name_map
+            for name in encoded:
+                value = name_map.get(name)
+                if value is None:
+                    value = id_format.format(self.counter)
+                    self.counter += 1
+                encoded[name] = value
+            name_map.update(encoded)
+        else:
+            encoder_func = self._row_encoder()
+            for name in encoded:
+                encoded[name] = encoder_func(name)
+        
+        return encoded
+    
     def process_file(
         self,
         input_path: str,
         output_path: str,
         name_column: str = "Last name First name",
         delimiter: str = "\t",
-        encoding: str = "utf-8"
+        encoding: str = "utf-8",
+        workers: int = 1
     ):
         """
         Process TXT file and encode the name column.
@@ -77,6 +378,7 @@ class NameEncoder:
             name_column: Name of the column to encode
             delimiter: Field delimiter
             encoding: File encoding (default: utf-8)
+            workers: Number of worker processes (default: 1, serial)
         """
         input_file = Path(input_path)
         output_file = Path(output_path)
@@ -84,12 +386,12 @@ class NameEncoder:
         if not input_file.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
         
-        encoder_func = self.get_encoder()
+        encoder_func = self._row_encoder()
         
         with open(input_file, 'r', encoding=encoding) as infile:
             # Read header
             header_line = infile.readline()
-            columns = [col.strip() for col in header_line.split(delimiter)]
+            columns = [col.strip() for col in header_line.rstrip('\r\n').split(delimiter)]
             
             # Find name column index
             try:
@@ -100,37 +402,105 @@ class NameEncoder:
                     f"Available columns: {', '.join(columns)}"
                 )
             
-            # Write header to output
             output_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_file, 'w', encoding=encoding) as outfile:
-                outfile.write(header_line)
-                
-                # Process data rows
-                total_rows = 0
-                encoded_count = 0
-                
-                for line in infile:
-                    if line.strip():
-                        fields = line.split(delimiter)
-                        
-                        # Encode the name field
-                        if name_col_idx < len(fields):
-                            original_name = fields[name_col_idx].strip()
-                            if original_name:
-                                fields[name_col_idx] = encoder_func(original_name)
-                                encoded_count += 1
-                        
-                        outfile.write(delimiter.join(fields))
-                        total_rows += 1
+            
+            # Universal newlines records the line endings read so far; a lone
+            # \r (CR-only files) ends lines in text mode but not for the byte path
+            newlines = infile.newlines or ()
+            if isinstance(newlines, str):
+                newlines = (newlines,)
+            
+            if codecs.lookup(encoding).name not in _BYTE_SAFE_ENCODINGS or '\r' in newlines:
+                # Multi-byte newline encodings (e.g. utf-16le) and CR-only
+                # files use text-mode iteration
+                with open(output_file, 'w', encoding=encoding) as outfile:
+                    outfile.write(header_line)
+                    total_rows, encoded_count = _encode_lines(
+                        infile, outfile, name_col_idx, delimiter, encoder_func
+                    )
+            else:
+                with open(input_file, 'rb') as f:
+                    f.readline()
+                    data_start = f.tell()
                 
-                print(f"✅ Processing complete!")
-                print(f"   Total rows: {total_rows:,}")
-                print(f"   Names encoded: {encoded_count:,}")
-                print(f"   Unique names: {len(self.name_map):,}")
-                print(f"   Output: {output_path}")
+                with open(output_file, 'wb') as outfile:
+                    outfile.write(header_line.encode(encoding))
+                    
+                    if workers > 1:
+                        total_rows, encoded_count = self._process_parallel(
+                            input_file, output_file, outfile, data_start,
+                            name_col_idx, delimiter, encoding, workers
+                        )
+                    else:
+                        with open(input_file, 'rb') as f, \
+                                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            total_rows, encoded_count = _encode_buffer(
+                                mm, data_start, len(mm), outfile,
+                                name_col_idx, delimiter, encoding, encoder_func
+                            )
+            
+            print(f"✅ Processing complete!")
+            print(f"   Total rows: {total_rows:,}")
+            print(f"   Names encoded: {encoded_count:,}")
+            print(f"   Unique names: {len(self.name_map) + len(self._hash_cache):,}")
+            print(f"   Output: {output_path}")
+    
+    def _process_parallel(
+        self,
+        input_file: Path,
+        output_file: Path,
+        outfile: BinaryIO,
+        data_start: int,
+        name_col_idx: int,
+        delimiter: str,
+        encoding: str,
+        workers: int
+    ) -> Tuple[int, int]:
+        """
+        Encode data rows across worker processes.
+        
+        Unique names are encoded up front in file order so sequential IDs match
+        the serial path; workers then only do lookups on their byte range and
+        write a part file, which is appended to the output in order.
+        """
+        with open(input_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            names = _collect_names(mm, data_start, len(mm), name_col_idx, delimiter, encoding)
+        name_map = self.encode_all(names)
+        
+        ranges = _split_ranges(input_file, data_start, workers)
+        part_paths = [
+            output_file.with_name(f"{output_file.name}.part{i}") for i in range(len(ranges))
+        ]
+        
+        total_rows = 0
+        encoded_count = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _encode_range, str(input_file), str(part_path), start, end,
+                        name_col_idx, delimiter, encoding, name_map
+                    )
+                    for (start, end), part_path in zip(ranges, part_paths)
+                ]
+                for future in futures:
+                    rows, encoded = future.result()
+                    total_rows += rows
+                    encoded_count += encoded
+            
+            for part_path in part_paths:
+                with open(part_path, 'rb') as part:
+                    shutil.copyfileobj(part, outfile)
+        finally:
+            for part_path in part_paths:
+                part_path.unlink(missing_ok=True)
+        
+        return total_rows, encoded_count
     
     def save_mapping(self, mapping_file: str):
         """Save the name mapping to a file for reference."""
+        self.name_map.update(self._hash_cache)
         if not self.name_map:
             return
         
@@ -151,12 +521,18 @@ Examples:
   # Encode with hash method
   python encode_names.py -i ECCSEP05.txt -o ECCSEP05_encoded.txt
 
+  # Encode with cryptographic SHA-256 hashes instead of xxh3
+  python encode_names.py -i ECCSEP05.txt -o ECCSEP05_encoded.txt -m hash --hash-algo sha256
+
   # Encode with sequential IDs
   python encode_names.py -i ECCSEP05.txt -o ECCSEP05_encoded.txt -m sequential
 
   # Encode and save mapping
   python encode_names.py -i ECCSEP05.txt -o ECCSEP05_encoded.txt -m simple --save-mapping
 
+  # Encode a large file with 8 worker processes
+  python encode_names.py -i ECCSEP05.txt -o ECCSEP05_encoded.txt -w 8
+
   # Custom column name
   python encode_names.py -i data.txt -o data_encoded.txt -c "Employee Name"
         """
@@ -181,6 +557,13 @@ Examples:
         help="Encoding method (default: simple)"
     )
     
+    parser.add_argument(
+        "--hash-algo",
+        choices=list(HASH_ALGORITHMS),
+        default="xxh3",
+        help="Hash algorithm for the hash method (default: xxh3; sha256 for cryptographic IDs)"
+    )
+    
     parser.add_argument(
         "-c", "--column",
         default="Last name First name",
@@ -199,6 +582,13 @@ Examples:
         help="File encoding (default: utf-8, try utf-16le for some files)"
     )
     
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for large files (default: 1)"
+    )
+    
     parser.add_argument(
         "--save-mapping",
         action="store_true",
@@ -213,13 +603,14 @@ Examples:
     print()
     
     try:
-        encoder = NameEncoder(encoding_method=args.method)
+        encoder = NameEncoder(encoding_method=args.method, hash_algo=args.hash_algo)
         encoder.process_file(
             input_path=args.input,
             output_path=args.output,
             name_column=args.column,
             delimiter=args.delimiter,
-            encoding=args.encoding
+            encoding=args.encoding,
+            workers=args.workers
         )
         
         if args.save_mapping:
@@ -7,7 +7,9 @@ from pathlib import Path
 from typing import Dict, Optional, Any
 from datetime import datetime
 from enum import Enum
+import asyncio
 import json
+import threading
 import uuid
 
 
@@ -42,6 +44,9 @@ class JobManager:
         
         # In-memory cache for quick access
         self._jobs_cache: Dict[str, Dict[str, Any]] = {}
+        
+        # Updates may arrive from worker threads (see update_job_async)
+        self._lock = threading.Lock()
     
     def create_job(
         self,
@@ -137,45 +142,55 @@ class JobManager:
             error: Error message if failed
             metadata: Additional metadata
         """
-        job_data = self.get_job(job_id)
-        if not job_data:
-            raise ValueError(f"Job {job_id} not found")
-        
-        # Update fields
-        if status is not None:
-            job_data["status"] = status
-            if status == JobStatus.LOADING_DATA and job_data["started_at"] is None:
-                job_data["started_at"] = datetime.now().isoformat()
-            elif status in (JobStatus.COMPLETED, JobStatus.FAILED):
-                job_data["completed_at"] = datetime.now().isoformat()
-        
-        if progress is not None:
-            job_data["progress"] = min(100.0, max(0.0, progress))
-        
-        if progress_message is not None:
-            job_data["progress_message"] = progress_message
-        
-        if processed_rows is not None:
-            job_data["processed_rows"] = processed_rows
-        
-        if total_rows is not None:
-            job_data["total_rows"] = total_rows
-        
-        if result_path is not None:
-            job_data["result_path"] = result_path
-        
-        if error is not None:
-            job_data["error"] = error
-            job_data["status"] = JobStatus.FAILED
-        
-        if metadata is not None:
-            job_data["metadata"].update(metadata)
-        
-        job_data["updated_at"] = datetime.now().isoformat()
+        with self._lock:
+            job_data = self.get_job(job_id)
+            if not job_data:
+                raise ValueError(f"Job {job_id} not found")
+            
+            # Update fields
+            if status is not None:
+                job_data["status"] = status
+                if status == JobStatus.LOADING_DATA and job_data["started_at"] is None:
+                    job_data["started_at"] = datetime.now().isoformat()
+                elif status in (JobStatus.COMPLETED, JobStatus.FAILED):
+                    job_data["completed_at"] = datetime.now().isoformat()
+            
+            if progress is not None:
+                job_data["progress"] = min(100.0, max(0.0, progress))
+            
+            if progress_message is not None:
+                job_data["progress_message"] = progress_message
+            
+            if processed_rows is not None:
+                job_data["processed_rows"] = processed_rows
+            
+            if total_rows is not None:
+                job_data["total_rows"] = total_rows
+            
+            if result_path is not None:
+                job_data["result_path"] = result_path
+            
+            if error is not None:
+                job_data["error"] = error
+                job_data["status"] = JobStatus.FAILED
+            
+            if metadata is not None:
+                job_data["metadata"].update(metadata)
+            
+            job_data["updated_at"] = datetime.now().isoformat()
+            
+            # Save to disk and cache
+            self._save_job(job_id, job_data)
+            self._jobs_cache[job_id] = job_data
+    
+    async def update_job_async(self, job_id: str, **kwargs):
+        """
+        Update a job from async code without blocking the event loop.
         
-        # Save to disk and cache
-        self._save_job(job_id, job_data)
-        self._jobs_cache[job_id] = job_data
+        Runs update_job (and its JSON write) in a worker thread; accepts the
+        same keyword arguments as update_job.
+        """
+        await asyncio.to_thread(self.update_job, job_id, **kwargs)
     
     def list_jobs(self, limit: int = 50) -> list[Dict[str, Any]]:
         """
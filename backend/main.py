@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
+import asyncio
 import uuid
 import os
 from datetime import datetime
@@ -185,15 +186,15 @@ async def parse_file_task(
             encoding=encoding
         )
         
-        # Parse file
-        result = parser.parse_to_json()
+        # Parse file in a worker thread so the event loop keeps serving requests
+        result = await asyncio.to_thread(parser.parse_to_json)
         
         # Save result
         result_dir = RESULTS_DIR / job_id
         result_dir.mkdir(parents=True, exist_ok=True)
         result_path = result_dir / f"{dataset_name}.json"
         
-        parser.save_json(result, str(result_path))
+        await asyncio.to_thread(parser.save_json, result, str(result_path))
         
         # Update job tracker
         job_tracker[job_id].update({
@@ -218,10 +219,10 @@ async def get_job_status(job_id: str):
     
     - **job_id**: Job identifier returned from /parse endpoint
     """
-    if job_id not in job_tracker:
+    job = job_tracker.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    job = job_tracker[job_id]
     return JobStatusResponse(**job)
 
 
@@ -232,11 +233,10 @@ async def get_result(job_id: str):
     
     - **job_id**: Job identifier
     """
-    if job_id not in job_tracker:
+    job = job_tracker.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    job = job_tracker[job_id]
-    
     if job["status"] != JobStatus.COMPLETED:
         raise HTTPException(
             status_code=400,
@@ -294,11 +294,10 @@ async def delete_job(job_id: str):
     
     - **job_id**: Job identifier
     """
-    if job_id not in job_tracker:
+    job = job_tracker.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
     
-    job = job_tracker[job_id]
-    
     # Delete result file if exists
     if job["result_path"]:
         result_path = Path(job["result_path"])
@@ -2,13 +2,133 @@
 Dask-based parser for TXT/CSV files with conversion to JSON.
 Handles large files efficiently with parallel processing.
 """
+import dask
 import dask.dataframe as dd
+from dask.utils import parse_bytes
 import pandas as pd
 import json
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import hashlib
+import csv
+import os
+
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # small files are read with the pandas C engine instead
+    pa = None
+    pacsv = None
+
+try:
+    import psutil
+except ImportError:  # blocksize falls back to a fixed default
+    psutil = None
+
+# pandas' default na_values for read_csv, so the Arrow reader nulls the same tokens
+_PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null"
+]
+
+# dtype pandas gives a column of Python strings ('str', or 'object' before
+# pandas 3); text columns keep it after stripping, as with the per-cell strip
+_TEXT_DTYPE = pd.Series([""]).dtype
+
+# Rows checked before converting a whole column to numbers
+_INFER_SAMPLE_ROWS = 10_000
+
+# Background threads for source-file hashing (hashlib releases the GIL)
+_THREAD_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-hash")
+
+# Bounds for the auto-tuned Dask blocksize
+_MIN_BLOCKSIZE = 16 * 1024 * 1024
+_MAX_BLOCKSIZE = 128 * 1024 * 1024
+
+
+def _default_blocksize() -> str:
+    """
+    Pick a Dask blocksize for this machine.
+    
+    Honors the DASK_BLOCKSIZE environment variable; otherwise sizes blocks
+    to about a tenth of available memory per core, clamped to 16-128 MB.
+    
+    Returns:
+        Blocksize string such as "64MB"
+    """
+    env_blocksize = os.environ.get("DASK_BLOCKSIZE")
+    if env_blocksize:
+        return env_blocksize
+    
+    if psutil is None:
+        return "64MB"
+    
+    cpus = psutil.cpu_count() or 1
+    per_core = psutil.virtual_memory().available // (cpus * 10)
+    blocksize = min(_MAX_BLOCKSIZE, max(_MIN_BLOCKSIZE, per_core))
+    return f"{blocksize // 1024 // 1024}MB"
+
+
+def _to_numeric(values: pd.Series) -> pd.Series:
+    """Convert a string column to numbers, ignoring quotes and thousands separators."""
+    cleaned = values.astype(str).str.replace(r'[",]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def _to_numeric_frame(pdf: pd.DataFrame) -> pd.DataFrame:
+    """Apply _to_numeric to every column of a partition."""
+    return pd.DataFrame({col: _to_numeric(pdf[col]) for col in pdf.columns}, index=pdf.index)
+
+
+def _numeric_profile(pdf: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize how each column of a partition converts to numbers.
+    
+    Rows are 'rows' (partition length), 'count' (values that convert) and
+    'integer' (1 when the converted column has an integer dtype; empty
+    partitions count as integer so they do not decide the type).
+    """
+    numeric = _to_numeric_frame(pdf)
+    empty = len(pdf) == 0
+    return pd.DataFrame(
+        {
+            col: [
+                len(pdf),
+                int(numeric[col].notna().sum()),
+                int(empty or pd.api.types.is_integer_dtype(numeric[col].dtype))
+            ]
+            for col in pdf.columns
+        },
+        index=['rows', 'count', 'integer'],
+        dtype='int64'
+    )
+
+
+def _fast_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Build row dictionaries column-wise, avoiding per-cell boxing in to_dict.
+    
+    Args:
+        df: DataFrame to convert
+        
+    Returns:
+        List of records, equivalent to df.to_dict(orient='records')
+    """
+    columns = [str(col) for col in df.columns]
+    # object arrays hold native Python scalars; pd.NA becomes None as in to_dict
+    arrays = [
+        df.iloc[:, i].to_numpy(dtype=object, na_value=None)
+        for i in range(df.shape[1])
+    ]
+    return [dict(zip(columns, row)) for row in zip(*arrays)]
 
 
 class DaskTxtParser:
@@ -22,7 +142,7 @@ class DaskTxtParser:
         file_path: str,
         delimiter: str = "\t",
         encoding: str = "utf-8",
-        blocksize: str = "64MB"
+        blocksize: Optional[str] = None
     ):
         """
         Initialize the parser.
@@ -32,11 +152,12 @@ class DaskTxtParser:
             delimiter: Field delimiter (default: tab)
             encoding: File encoding (default: utf-8)
             blocksize: Dask block size for parallel reading
+                (default: DASK_BLOCKSIZE or tuned to available memory)
         """
         self.file_path = Path(file_path)
         self.delimiter = delimiter
         self.encoding = encoding
-        self.blocksize = blocksize
+        self.blocksize = blocksize or _default_blocksize()
         
         if not self.file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
@@ -49,16 +170,19 @@ class DaskTxtParser:
             Dask DataFrame
         """
         try:
-            # UTF-16 files have issues with Dask sampling, use pandas then convert to dask
+            # UTF-16 files have issues with Dask sampling, read in one go then convert to dask
             if 'utf-16' in self.encoding.lower():
-                print("  Using pandas for UTF-16 encoding (then converting to Dask)...")
-                pdf = pd.read_csv(
-                    str(self.file_path),
-                    delimiter=self.delimiter,
-                    encoding=self.encoding,
-                    dtype=str,
-                    on_bad_lines='skip'
-                )
+                print("  Using pyarrow/pandas for UTF-16 encoding (then converting to Dask)...")
+                # pyarrow transcodes to UTF-8 in C++ and parses multithreaded
+                pdf = self._read_arrow()
+                if pdf is None:
+                    pdf = pd.read_csv(
+                        str(self.file_path),
+                        delimiter=self.delimiter,
+                        encoding=self.encoding,
+                        dtype=str,
+                        on_bad_lines='skip'
+                    )
                 # Clean column names
                 pdf.columns = [col.strip() for col in pdf.columns]
                 # Convert to Dask DataFrame with partitions
@@ -66,6 +190,22 @@ class DaskTxtParser:
                 ddf = dd.from_pandas(pdf, npartitions=npartitions)
                 return ddf
             
+            # Small files: Dask's graph and scheduler overhead outweighs any
+            # parallelism, so read in one go and wrap as a single partition
+            if self.file_path.stat().st_size < 2 * parse_bytes(self.blocksize):
+                pdf = self._read_arrow()
+                if pdf is None:
+                    pdf = pd.read_csv(
+                        str(self.file_path),
+                        delimiter=self.delimiter,
+                        encoding=self.encoding,
+                        dtype=str,
+                        on_bad_lines='skip',
+                        engine='c'
+                    )
+                pdf.columns = [col.strip() for col in pdf.columns]
+                return dd.from_pandas(pdf, npartitions=1)
+            
             # For other encodings, use Dask directly
             sample_size = 256000  # 256KB in bytes
             
@@ -89,6 +229,65 @@ class DaskTxtParser:
         except Exception as e:
             raise ValueError(f"Failed to read file: {str(e)}")
     
+    def _read_arrow(self) -> Optional[pd.DataFrame]:
+        """
+        Read the whole file with pyarrow's multithreaded CSV reader.
+        
+        All columns are read as strings, as with dtype=str in pandas, and
+        pandas' default NA tokens become missing values. Returns
+        None when pyarrow is unavailable or the file needs pandas' handling
+        (short rows, which pandas pads instead of skipping, or a header that
+        Arrow rejects or pandas renames) so the caller can fall back to
+        pd.read_csv.
+        
+        Returns:
+            Pandas DataFrame with string columns, or None
+        """
+        if pacsv is None:
+            return None
+        
+        with open(self.file_path, 'r', encoding=self.encoding, newline='') as f:
+            header = next(csv.reader(f, delimiter=self.delimiter), None)
+        if not header:
+            return None
+        # Arrow (like pandas) drops a leading byte-order mark from the first name
+        header[0] = header[0].lstrip('\ufeff')
+        # Duplicate or empty names get pandas' renaming (x.1, Unnamed: N)
+        if len(set(header)) != len(header) or not all(header):
+            return None
+        
+        short_rows = []
+        
+        def skip_invalid(row):
+            # pandas keeps short rows (padded with NaN); only long rows are dropped
+            if row.actual_columns < row.expected_columns:
+                short_rows.append(row.number)
+            return 'skip'
+        
+        try:
+            table = pacsv.read_csv(
+                str(self.file_path),
+                read_options=pacsv.ReadOptions(encoding=self.encoding, block_size=64 << 20),
+                parse_options=pacsv.ParseOptions(
+                    delimiter=self.delimiter,
+                    invalid_row_handler=skip_invalid
+                ),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={name: pa.string() for name in header},
+                    null_values=_PANDAS_NA_VALUES,
+                    strings_can_be_null=True
+                )
+            )
+        except (pa.ArrowInvalid, ValueError):
+            return None
+        
+        # Every column must have come back as text, or clean_data's .str fails
+        if short_rows or any(not pa.types.is_string(t) for t in table.schema.types):
+            return None
+        
+        # Default conversion gives the same string dtype as read_csv(dtype=str)
+        return table.to_pandas()
+    
     def clean_data(self, ddf: dd.DataFrame) -> dd.DataFrame:
         """
         Clean and normalize data.
@@ -99,12 +298,10 @@ class DaskTxtParser:
         Returns:
             Cleaned Dask DataFrame
         """
-        # Strip whitespace from all string columns
+        # Strip whitespace from all columns (read with dtype=str) in one
+        # vectorized pass each; missing values stay missing
         for col in ddf.columns:
-            ddf[col] = ddf[col].apply(
-                lambda x: x.strip() if isinstance(x, str) else x,
-                meta=(col, 'object')
-            )
+            ddf[col] = ddf[col].str.strip().astype(_TEXT_DTYPE)
         
         return ddf
     
@@ -118,19 +315,27 @@ class DaskTxtParser:
         Returns:
             DataFrame with converted types
         """
+        n = len(df)
+        if n == 0:
+            return df
+        
+        sample = df.head(_INFER_SAMPLE_ROWS)
         for col in df.columns:
             # Skip if already numeric
             if pd.api.types.is_numeric_dtype(df[col]):
                 continue
             
-            # Try to convert to numeric
             try:
-                # Remove quotes and commas
-                cleaned = df[col].astype(str).str.replace('"', '').str.replace(',', '')
-                numeric = pd.to_numeric(cleaned, errors='coerce')
+                # Cheap check on a sample first: more than 20% of all rows
+                # failing already rules the column out, wherever they are
+                sample_failures = len(sample) - _to_numeric(sample[col]).notna().sum()
+                if sample_failures > 0.2 * n:
+                    continue
+                
+                numeric = _to_numeric(df[col])
                 
                 # If most values convert successfully, use numeric type
-                if numeric.notna().sum() / len(df) > 0.8:
+                if numeric.notna().sum() / n > 0.8:
                     df[col] = numeric
             except:
                 pass
@@ -144,27 +349,45 @@ class DaskTxtParser:
         Returns:
             Dictionary with metadata and data records
         """
+        # Hash the source file for traceability while Dask parses it
+        hash_future = _THREAD_POOL.submit(self._calculate_file_hash)
+        
         # Read file with Dask
         ddf = self.read_file()
         
         # Clean data
         ddf = self.clean_data(ddf)
         
-        # Compute to Pandas for final processing
-        # For very large files, consider partitioned processing
-        df = ddf.compute()
-        
-        # Infer and convert numeric columns
-        df = self.infer_numeric_columns(df)
-        
-        # Replace NaN with None for JSON compatibility
-        df = df.where(pd.notna(df), None)
+        if ddf.npartitions == 1:
+            # Nothing to parallelize: compute and infer types in pandas
+            df = self.infer_numeric_columns(ddf.compute())
+        else:
+            # Convert text columns on every partition in parallel, in the same
+            # pass that computes the data, so the ratio covers the whole column
+            # and winning columns reuse the converted values
+            text_cols = [
+                col for col in ddf.columns
+                if not pd.api.types.is_numeric_dtype(ddf[col].dtype)
+            ]
+            if text_cols:
+                meta = pd.DataFrame({col: pd.Series(dtype='float64') for col in text_cols})
+                numeric_ddf = ddf[text_cols].map_partitions(_to_numeric_frame, meta=meta)
+                df, numeric = dask.compute(ddf, numeric_ddf)
+                counts = numeric.notna().sum()
+            else:
+                df = ddf.compute()
+            
+            n = len(df)
+            for col in text_cols:
+                # If most values convert successfully, use numeric type
+                if n and counts[col] / n > 0.8:
+                    # Partition indexes repeat, so assign by position
+                    df[col] = numeric[col].to_numpy()
         
-        # Convert to records
-        records = df.to_dict(orient='records')
+        # Convert to records (missing values become None for JSON)
+        records = _fast_records(df)
         
-        # Calculate file hash for traceability
-        file_hash = self._calculate_file_hash()
+        file_hash = hash_future.result()
         
         # Build result
         result = {
@@ -185,10 +408,92 @@ class DaskTxtParser:
         
         return result
     
+    def parse_to_ndjson(self, output_path: str) -> Dict[str, Any]:
+        """
+        Parse the file and stream records to disk as NDJSON, one partition at a time.
+        
+        A first pass over the partitions only counts convertible values, so
+        numeric columns are chosen on the whole column as in parse_to_json.
+        The second pass converts and writes one partition at a time, so memory
+        stays bounded by the partition size instead of the whole file.
+        Metadata is written to a sidecar ``<output_path>.meta.json``.
+        
+        Args:
+            output_path: Output NDJSON file path
+            
+        Returns:
+            Metadata dictionary (same fields as parse_to_json's "metadata")
+        """
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Hash the source file for traceability while Dask parses it
+        hash_future = _THREAD_POOL.submit(self._calculate_file_hash)
+        
+        ddf = self.clean_data(self.read_file())
+        
+        text_cols = [
+            col for col in ddf.columns
+            if not pd.api.types.is_numeric_dtype(ddf[col].dtype)
+        ]
+        numeric_types: Dict[str, str] = {}
+        if text_cols:
+            meta = pd.DataFrame({col: pd.Series(dtype='int64') for col in text_cols})
+            profile = ddf[text_cols].map_partitions(_numeric_profile, meta=meta).compute()
+            n = profile.loc[['rows']].sum()
+            counts = profile.loc[['count']].sum()
+            integer = profile.loc[['integer']].all()
+            for col in text_cols:
+                # If most values convert successfully, use numeric type; the
+                # whole column is integer only if every partition was
+                if n[col] and counts[col] / n[col] > 0.8:
+                    numeric_types[col] = 'int64' if integer[col] else 'float64'
+        
+        if orjson is not None:
+            dumps = orjson.dumps
+        else:
+            dumps = lambda rec: json.dumps(rec, ensure_ascii=False).encode('utf-8')
+        
+        rows = 0
+        with open(output_file, 'wb') as f:
+            for part in ddf.to_delayed():
+                pdf = part.compute()
+                if pdf.empty:
+                    continue
+                
+                pdf = pdf.assign(**{
+                    col: _to_numeric(pdf[col]).astype(dtype)
+                    for col, dtype in numeric_types.items()
+                })
+                records = _fast_records(pdf)
+                f.write(b'\n'.join(map(dumps, records)) + b'\n')
+                rows += len(records)
+        
+        metadata = {
+            "source_file": self.file_path.name,
+            "source_path": str(self.file_path),
+            "delimiter": self.delimiter,
+            "encoding": self.encoding,
+            "rows": rows,
+            "columns": list(ddf.columns),
+            "column_types": {
+                col: numeric_types.get(col, str(dtype)) for col, dtype in ddf.dtypes.items()
+            },
+            "parsed_at": datetime.now().isoformat(),
+            "file_size_bytes": self.file_path.stat().st_size,
+            "sha256": hash_future.result()
+        }
+        self.save_json(metadata, f"{output_file}.meta.json")
+        
+        return metadata
+    
     def save_json(self, data: Dict[str, Any], output_path: str, indent: int = 2):
         """
         Save parsed data to JSON file.
         
+        Uses orjson when installed (it only supports indent 2 or none);
+        other indents go through the stdlib encoder.
+        
         Args:
             data: Dictionary to save
             output_path: Output file path
@@ -197,16 +502,29 @@ class DaskTxtParser:
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
         
+        if orjson is not None and indent in (None, 2):
+            option = orjson.OPT_NON_STR_KEYS
+            if indent == 2:
+                option |= orjson.OPT_INDENT_2
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+            return
+        
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=indent, ensure_ascii=False)
     
     def _calculate_file_hash(self) -> str:
         """Calculate SHA256 hash of the source file."""
-        sha256_hash = hashlib.sha256()
         with open(self.file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
+            # Python 3.11+: hashes straight from the file buffer
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, "sha256").hexdigest()
+            
+            # 1 MiB blocks: few Python-level calls, and hashlib drops the GIL per block
+            sha256_hash = hashlib.sha256()
+            for byte_block in iter(lambda: f.read(1 << 20), b""):
                 sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+            return sha256_hash.hexdigest()
     
     @staticmethod
     def parse_file_to_json(
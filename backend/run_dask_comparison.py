@@ -7,6 +7,11 @@ import json
 from pathlib import Path
 from compare_dask import DaskDataComparator
 
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder
+    orjson = None
+
 
 def main():
     print("=" * 70)
@@ -78,8 +83,16 @@ def main():
         output_dir.mkdir(parents=True, exist_ok=True)
         output_file = output_dir / "dask_comparison_ECCSEP01_vs_ECP_1.json"
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, default=str)
+        if orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(
+                    result,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, default=str)
         
         print(f"Full results saved to: {output_file}")
         print()
@@ -95,9 +108,6 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
-    finally:
-        comparator.stop_cluster()
-        print("Dask cluster stopped.")
 
 
 if __name__ == "__main__":
@@ -2,50 +2,58 @@
 Test cases for the TXT parser and FastAPI endpoints.
 """
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+import httpx
 from pathlib import Path
 import json
 import tempfile
+import codecs
+import pandas as pd
+import zipfile
 
 from backend.main import app
 from backend.parser import DaskTxtParser
 from backend.models import JobStatus
+from backend import api_comparison
+from backend.encode_names import NameEncoder
 
 
-client = TestClient(app)
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """Async client bound to the app, shared by all endpoint tests."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
 
 
-@pytest.fixture
-def sample_txt_file():
-    """Create a sample TXT file for testing."""
+@pytest.fixture(scope="session")
+def sample_txt_file(tmp_path_factory):
+    """Create a sample TXT file for testing (once per session)."""
     content = """Name\tAge\tCity\tSalary
 John Doe\t30\tNew York\t75000
 Jane Smith\t25\tLos Angeles\t82000
 Bob Johnson\t35\tChicago\t68000"""
     
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-        f.write(content)
-        temp_path = f.name
-    
-    yield temp_path
-    
-    # Cleanup
-    Path(temp_path).unlink(missing_ok=True)
+    temp_path = tmp_path_factory.mktemp("samples") / "sample.txt"
+    temp_path.write_text(content)
+    return str(temp_path)
 
 
-def test_root_endpoint():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_root_endpoint(client):
     """Test the root endpoint."""
-    response = client.get("/")
+    response = await client.get("/")
     assert response.status_code == 200
     data = response.json()
     assert "service" in data
     assert data["service"] == "Data Comparison API"
 
 
-def test_parse_endpoint(sample_txt_file):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_parse_endpoint(client, sample_txt_file):
     """Test file upload and parsing."""
     with open(sample_txt_file, 'rb') as f:
-        response = client.post(
+        response = await client.post(
             "/parse?delimiter=%09&dataset_name=test",
             files={"file": ("test.txt", f, "text/plain")}
         )
@@ -59,9 +67,10 @@ def test_parse_endpoint(sample_txt_file):
     return data["job_id"]
 
 
-def test_status_endpoint_not_found():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_status_endpoint_not_found(client):
     """Test status endpoint with invalid job ID."""
-    response = client.get("/status/invalid-job-id")
+    response = await client.get("/status/invalid-job-id")
     assert response.status_code == 404
 
 
@@ -96,6 +105,17 @@ def test_dask_parser_numeric_inference(sample_txt_file):
     assert isinstance(first_record["Salary"], (int, float))
 
 
+def test_dask_parser_text_column_types(tmp_path):
+    """Test that stripped text columns keep pandas' default string dtype name."""
+    data_file = tmp_path / "text.txt"
+    data_file.write_text("Id\tName\n1\t A \n2\t\n")
+    
+    result = DaskTxtParser(file_path=str(data_file), delimiter="\t").parse_to_json()
+    
+    assert result["metadata"]["column_types"]["Name"] == str(pd.Series([""]).dtype)
+    assert result["data"] == [{"Id": 1, "Name": "A"}, {"Id": 2, "Name": None}]
+
+
 def test_dask_parser_save_json(sample_txt_file):
     """Test saving parsed data to JSON."""
     parser = DaskTxtParser(
@@ -122,6 +142,129 @@ def test_dask_parser_save_json(sample_txt_file):
         Path(output_path).unlink(missing_ok=True)
 
 
+def test_dask_parser_utf8_bom(tmp_path):
+    """Test that a UTF-8 byte-order mark does not end up in the first column."""
+    bom_file = tmp_path / "bom.txt"
+    bom_file.write_text("Id\tName\n1\tA\n2\tB\n", encoding="utf-8-sig")
+    
+    parser = DaskTxtParser(file_path=str(bom_file), delimiter="\t")
+    result = parser.parse_to_json()
+    
+    assert result["metadata"]["columns"] == ["Id", "Name"]
+    assert result["data"][0] == {"Id": 1, "Name": "A"}
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-16-le"])
+@pytest.mark.parametrize("content, columns", [
+    ("Id\tName\n1\tA\n2\tB\n", ["Id", "Name"]),
+    ("Id\tName\t\n1\tA\t\n2\tB\t\n", ["Id", "Name", "Unnamed: 2"]),  # trailing tab
+])
+def test_dask_parser_utf16_bom(tmp_path, encoding, content, columns):
+    """Test that UTF-16 files with a byte-order mark parse on the UTF-16 path."""
+    bom_file = tmp_path / "bom16.txt"
+    bom_file.write_bytes(codecs.BOM_UTF16_LE + content.encode("utf-16-le"))
+    
+    parser = DaskTxtParser(file_path=str(bom_file), delimiter="\t", encoding=encoding)
+    result = parser.parse_to_json()
+    
+    assert result["metadata"]["columns"] == columns
+    assert [{"Id": r["Id"], "Name": r["Name"]} for r in result["data"]] == [
+        {"Id": 1, "Name": "A"}, {"Id": 2, "Name": "B"}
+    ]
+    assert all(set(r) == set(columns) for r in result["data"])
+
+
+def test_arrow_reader_matches_pandas_na_handling(tmp_path):
+    """Test that the Arrow reader nulls the same tokens, with the same dtypes, as pandas."""
+    pytest.importorskip("pyarrow")
+    na_file = tmp_path / "na.txt"
+    na_file.write_text(
+        "Id\tName\n1\tA\n2\tNone\n3\t<NA>\n4\tNULL\n5\t\n6\tn/a\n7\tnan\n",
+        encoding="utf-8"
+    )
+    
+    parser = DaskTxtParser(file_path=str(na_file), delimiter="\t")
+    arrow_df = parser._read_arrow()
+    pandas_df = pd.read_csv(str(na_file), delimiter="\t", dtype=str)
+    
+    assert arrow_df is not None
+    pd.testing.assert_frame_equal(arrow_df, pandas_df)
+    assert arrow_df["Name"].isna().sum() == 6
+
+
+@pytest.mark.parametrize("content", [
+    "Id\tName\t\n1\tA\t\n2\tB\t\n",  # trailing delimiter in the header
+    "Id\t\tName\n1\tx\tA\n2\ty\tB\n",  # empty middle header cell
+])
+def test_arrow_reader_empty_header_matches_pandas(tmp_path, content):
+    """Test that empty header cells get pandas' 'Unnamed: N' names, not ''."""
+    pytest.importorskip("pyarrow")
+    data_file = tmp_path / "empty_header.txt"
+    data_file.write_text(content, encoding="utf-8")
+    
+    parser = DaskTxtParser(file_path=str(data_file), delimiter="\t")
+    pandas_df = pd.read_csv(str(data_file), delimiter="\t", dtype=str)
+    
+    assert parser._read_arrow() is None
+    assert list(parser.read_file().columns) == list(pandas_df.columns)
+
+
+def test_dask_parser_numeric_inference_whole_column(tmp_path):
+    """Test that numeric inference over several partitions looks at the whole column."""
+    lines = ["Id\tCode"]
+    lines += [f"{i}\tabc" for i in range(300)]  # text early in the file
+    lines += [f"{i}\t{i * 7}" for i in range(300, 3300)]  # but >80% numeric overall
+    data_file = tmp_path / "late_numeric.txt"
+    data_file.write_text("\n".join(lines) + "\n")
+    
+    parser = DaskTxtParser(file_path=str(data_file), delimiter="\t", blocksize="8KB")
+    assert parser.read_file().npartitions > 1
+    
+    result = parser.parse_to_json()
+    
+    assert result["metadata"]["column_types"]["Code"] == "float64"
+    assert result["data"][0]["Code"] is None
+    assert result["data"][400]["Code"] == 2800.0
+
+
+def test_infer_numeric_columns_beyond_sample(tmp_path):
+    """Test that text in the sampled leading rows does not hide a mostly numeric column."""
+    lines = ["Id\tCode"]
+    lines += [f"{i}\tabc" for i in range(10000)]
+    lines += [f"{i}\t{i}" for i in range(10000, 55000)]
+    data_file = tmp_path / "numeric_after_sample.txt"
+    data_file.write_text("\n".join(lines) + "\n")
+    
+    result = DaskTxtParser(file_path=str(data_file), delimiter="\t").parse_to_json()
+    
+    assert result["metadata"]["column_types"]["Code"] == "float64"
+
+
+@pytest.mark.parametrize("blocksize", ["8KB", None])
+def test_dask_parser_ndjson_matches_parse_to_json(tmp_path, blocksize):
+    """Test that streamed NDJSON records and metadata match parse_to_json."""
+    lines = ["Id\tCode\tName"]
+    lines += [f"{i}\tabc\tName {i}" for i in range(300)]  # text early in the file
+    lines += [f"{i}\t{i * 7}\t" for i in range(300, 3300)]
+    data_file = tmp_path / "stream.txt"
+    data_file.write_text("\n".join(lines) + "\n")
+    output_file = tmp_path / "stream.ndjson"
+    
+    parser = DaskTxtParser(file_path=str(data_file), delimiter="\t", blocksize=blocksize)
+    expected = parser.parse_to_json()
+    metadata = parser.parse_to_ndjson(str(output_file))
+    
+    with open(output_file, "r") as f:
+        records = [json.loads(line) for line in f]
+    with open(f"{output_file}.meta.json", "r") as f:
+        sidecar = json.load(f)
+    
+    assert records == expected["data"]
+    for key in ("rows", "columns", "column_types"):
+        assert metadata[key] == sidecar[key] == expected["metadata"][key]
+    assert metadata["column_types"]["Code"] == "float64"
+
+
 def test_parser_file_not_found():
     """Test parser with non-existent file."""
     with pytest.raises(FileNotFoundError):
@@ -131,9 +274,93 @@ def test_parser_file_not_found():
         )
 
 
-def test_list_jobs_endpoint():
+@pytest.mark.parametrize("workers", [2, 7])
+@pytest.mark.parametrize("name_column", ["Name", "Dept", "Id"])
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("trailing_newline", [True, False])
+def test_encode_names_parallel_matches_serial(tmp_path, workers, name_column, newline, trailing_newline):
+    """Test that the process-pool encoder writes the same bytes as the serial path."""
+    # Uneven line lengths so range boundaries land mid-line
+    rows = [f"{i}\tPerson {i % 5}{'x' * (i % 11)}\tDept {i % 3}" for i in range(40)]
+    rows.insert(17, "")
+    content = newline.join(["Id\tName\tDept"] + rows)
+    if trailing_newline:
+        content += newline
+    input_file = tmp_path / "names.txt"
+    input_file.write_bytes(content.encode("utf-8"))
+    
+    serial_file = tmp_path / "serial.txt"
+    parallel_file = tmp_path / "parallel.txt"
+    NameEncoder("sequential").process_file(
+        str(input_file), str(serial_file), name_column=name_column, workers=1
+    )
+    NameEncoder("sequential").process_file(
+        str(input_file), str(parallel_file), name_column=name_column, workers=workers
+    )
+    
+    # Rows come out with \n endings, blank lines dropped, names numbered in order
+    header = ["Id", "Name", "Dept"]
+    name_idx = header.index(name_column)
+    ids = {}
+    expected = ["\t".join(header)]
+    for row in filter(None, rows):
+        fields = row.split("\t")
+        if fields[name_idx] not in ids:
+            ids[fields[name_idx]] = f"USER_{len(ids) + 1:04d}"
+        fields[name_idx] = ids[fields[name_idx]]
+        expected.append("\t".join(fields))
+    expected_text = "\n".join(expected) + ("\n" if trailing_newline else "")
+    
+    assert serial_file.read_text(encoding="utf-8") == expected_text
+    assert parallel_file.read_bytes() == serial_file.read_bytes()
+    assert list(tmp_path.glob("parallel.txt.part*")) == []
+
+
+@pytest.fixture
+def comparison_json_dir(tmp_path, monkeypatch):
+    """Point the comparison viewer API at an empty JSON directory."""
+    bundle_cache = {'stamp': None, 'zip': None}
+    monkeypatch.setattr(api_comparison, "JSON_DIR", tmp_path)
+    monkeypatch.setattr(api_comparison, "_bundle_cache", bundle_cache)
+    yield tmp_path
+    if bundle_cache['zip'] is not None:
+        bundle_cache['zip'].close()
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_comparison_employee_from_bundle(client, comparison_json_dir):
+    """Test that employee data is read from bundle.zip, ignoring stale loose files."""
+    with zipfile.ZipFile(comparison_json_dir / "bundle.zip", "w") as bundle:
+        bundle.writestr("100.json", json.dumps({"pernr": "100", "source": "bundle"}))
+    (comparison_json_dir / "100.json").write_text(json.dumps({"pernr": "100", "source": "loose"}))
+    (comparison_json_dir / "200.json").write_text(json.dumps({"pernr": "200", "source": "loose"}))
+    
+    response = await client.get("/api/comparison/employee/100")
+    assert response.status_code == 200
+    assert response.json()["source"] == "bundle"
+    
+    # Not in the bundle: a leftover loose file must not be served
+    response = await client.get("/api/comparison/employee/200")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_comparison_employee_from_loose_file(client, comparison_json_dir):
+    """Test that loose {pernr}.json files are served when there is no bundle."""
+    (comparison_json_dir / "300.json").write_text(json.dumps({"pernr": "300", "source": "loose"}))
+    
+    response = await client.get("/api/comparison/employee/300")
+    assert response.status_code == 200
+    assert response.json()["source"] == "loose"
+    
+    response = await client.get("/api/comparison/employee/400")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_list_jobs_endpoint(client):
     """Test listing jobs."""
-    response = client.get("/jobs?limit=10")
+    response = await client.get("/jobs?limit=10")
     assert response.status_code == 200
     data = response.json()
     assert "total" in data
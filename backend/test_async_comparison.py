@@ -115,8 +115,6 @@ def test_async_comparison():
         import traceback
         traceback.print_exc()
         return False
-    finally:
-        comparator.stop_cluster()
     
     return True
 
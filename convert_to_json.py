@@ -1,27 +1,52 @@
 #!/usr/bin/env python3
 """
 Convert comparison text files to JSON format for web interface.
-Creates an index file and individual JSON files for each employee.
+Creates an index file and a zip bundle holding one JSON document per employee.
 """
 
 import json
+import os
+import zipfile
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder
+    orjson = None
+
+# Per-employee JSON documents are stored (uncompressed) in this archive
+BUNDLE_NAME = 'bundle.zip'
+
+
+def encode_json(data):
+    """Encode data as indented UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def write_json(path, data):
+    """Write data as indented JSON."""
+    with open(path, 'wb') as f:
+        f.write(encode_json(data))
 
 
 def parse_amount(amount_str):
     """Parse amount string to float, handling commas and negative values."""
-    if not amount_str or amount_str.strip() == '':
+    if not amount_str or amount_str.isspace():
         return None
     
-    # Remove commas
+    # Remove commas; a value made only of commas leaves nothing to parse
     amount_str = amount_str.replace(',', '')
-    
-    # Handle negative values with trailing minus sign
-    if amount_str.endswith('-'):
-        return -float(amount_str[:-1])
+    if not amount_str:
+        return None
     
     try:
+        # Handle negative values with trailing minus sign
+        if amount_str[-1] == '-':
+            return -float(amount_str[:-1])
         return float(amount_str)
     except ValueError:
         return None
@@ -42,13 +67,12 @@ def parse_comparison_file(file_path):
     # Parse data rows (skip first 6 lines: 
     # line 0: separator, line 1: header, line 2: separator, line 3: blank, line 4: column headers, line 5: separator)
     # Data starts at line 6
-    data_lines = [line.strip() for line in lines[6:] if line.strip()]
-    
     entries = []
     employee_name = None
     
-    for line in data_lines:
-        parts = line.split('\t')
+    for line in lines[6:]:
+        # Strip once per line; blank lines fall out at the length check
+        parts = line.strip().split('\t')
         if len(parts) < 16:
             continue
         
@@ -92,24 +116,26 @@ def parse_comparison_file(file_path):
     }
 
 
-def create_index(json_dir):
-    """Create an index of all employees for quick lookup."""
-    json_files = sorted(json_dir.glob('*.json'))
-    
-    index = []
-    for json_file in json_files:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+def _convert_one(comp_file):
+    """
+    Convert one comparison file to JSON.
+    
+    Returns (index entry, encoded JSON, None) on success or
+    (None, None, error message), so the index can be built without reading
+    the JSON back and the bundle is written by a single process.
+    """
+    try:
+        data = parse_comparison_file(comp_file)
         
-        index.append({
+        return {
             'ecp_pernr': data['ecp_pernr'],
             'ecc_pernr': data['ecc_pernr'],
             'name': data['name'],
             'total_entries': data['total_entries'],
-            'file': json_file.name
-        })
-    
-    return index
+            'file': f"{comp_file.stem}.json"
+        }, encode_json(data), None
+    except Exception as e:
+        return None, None, str(e)
 
 
 def main():
@@ -131,40 +157,45 @@ def main():
     
     processed = 0
     errors = 0
+    index = []
     
-    for i, comp_file in enumerate(comparison_files, 1):
-        try:
-            # Parse the comparison file
-            data = parse_comparison_file(comp_file)
-            
-            # Write JSON file
-            json_file = json_dir / f"{comp_file.stem}.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-            
-            processed += 1
-            
-            if processed % 5000 == 0:
-                print(f"  Processed {processed}/{len(comparison_files)} files ({processed*100//len(comparison_files)}%)...")
+    # Write into a temporary archive and swap it in at the end, so readers
+    # never see a half-written bundle
+    bundle_file = json_dir / BUNDLE_NAME
+    tmp_bundle = json_dir / f"{BUNDLE_NAME}.tmp"
+    
+    # Files are independent: parse them across all cores; one sequential
+    # archive replaces thousands of small file creates
+    with ProcessPoolExecutor() as executor, \
+            zipfile.ZipFile(tmp_bundle, 'w', compression=zipfile.ZIP_STORED) as bundle:
+        results = executor.map(_convert_one, comparison_files, chunksize=64)
         
-        except Exception as e:
-            if errors < 5:
-                print(f"Error processing {comp_file.name}: {e}")
-            errors += 1
+        for comp_file, (entry, payload, error) in zip(comparison_files, results):
+            if entry is not None:
+                bundle.writestr(entry['file'], payload)
+                index.append(entry)
+                processed += 1
+                
+                if processed % 5000 == 0:
+                    print(f"  Processed {processed}/{len(comparison_files)} files ({processed*100//len(comparison_files)}%)...")
+            else:
+                if errors < 5:
+                    print(f"Error processing {comp_file.name}: {error}")
+                errors += 1
+    
+    os.replace(tmp_bundle, bundle_file)
     
     print(f"\nCreating index file...")
     
-    # Create index
-    index = create_index(json_dir)
+    # Index entries were collected from the conversion results (already in file order)
     index_file = json_dir / 'index.json'
-    
-    with open(index_file, 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2)
+    write_json(index_file, index)
     
     print(f"\nJSON conversion complete!")
     print(f"  Files converted: {processed}")
     print(f"  Errors: {errors}")
     print(f"  Index created: {index_file}")
+    print(f"  Bundle created: {bundle_file}")
     print(f"  Output directory: {json_dir.absolute()}")
 
 
@@ -5,23 +5,25 @@ Compares ECC and ECP data side-by-side with differences.
 """
 
 import csv
+import os
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 
 def parse_amount(amount_str):
     """Parse amount string to float, handling commas and negative values."""
-    if not amount_str or amount_str.strip() == '':
+    if not amount_str or amount_str.isspace():
         return 0.0
     
     # Remove commas
     amount_str = amount_str.replace(',', '')
     
-    # Handle negative values with trailing minus sign (e.g., "2,200.00-")
-    if amount_str.endswith('-'):
-        return -float(amount_str[:-1])
-    
     try:
+        # Handle negative values with trailing minus sign (e.g., "2,200.00-")
+        if amount_str.endswith('-'):
+            return -float(amount_str[:-1])
         return float(amount_str)
     except ValueError:
         return 0.0
@@ -42,11 +44,17 @@ def format_amount(amount):
     return formatted
 
 
+# Banner lines for the comparison files, built once
+COMPARISON_RULE = '=' * 200
+COMPARISON_SEPARATOR = '-' * 200
+
+# Categories whose sort key differs from their name; everything else sorts as itself
+CATEGORY_SORT_KEYS = {'UNKNOWN': 'ZZZZ_UNKNOWN'}
+
+
 def get_category_sort_key(category):
     """Map category to sort key, putting UNKNOWN at the end."""
-    if category == 'UNKNOWN':
-        return 'ZZZZ_UNKNOWN'
-    return category
+    return CATEGORY_SORT_KEYS.get(category, category)
 
 
 def create_comparison_file(actuals_file_path, comparison_file_path):
@@ -68,6 +76,17 @@ def create_comparison_file(actuals_file_path, comparison_file_path):
     # Line 4 is the column headers, Line 5 is the separator
     data_lines = [line.strip() for line in lines[6:] if line.strip()]
     
+    create_comparison_from_rows((line.split('\t') for line in data_lines), comparison_file_path)
+
+
+def create_comparison_from_rows(rows, comparison_file_path):
+    """
+    Create a comparison file from actuals rows that are already in memory.
+    
+    Each row holds the 11 actuals fields (System, Pers. No, name, ...,
+    Amount, Category) in file order. Rows without a Category are skipped,
+    as they are when read back from an actuals file.
+    """
     # Parse data into structured format
     ecc_data = {}  # key: (category, wt, long_text) -> data dict
     ecp_data = {}  # key: (category, wt, long_text) -> data dict
@@ -76,9 +95,8 @@ def create_comparison_file(actuals_file_path, comparison_file_path):
     pers_no_ecp = None
     name = None
     
-    for line in data_lines:
-        parts = line.split('\t')
-        if len(parts) < 11:
+    for parts in rows:
+        if len(parts) < 11 or not parts[10]:
             continue
         
         system = parts[0]
@@ -119,8 +137,12 @@ def create_comparison_file(actuals_file_path, comparison_file_path):
     # Get all unique keys (category, wt, long_text combinations)
     all_keys = set(ecc_data.keys()) | set(ecp_data.keys())
     
-    # Sort by category then by WT
-    sorted_keys = sorted(all_keys, key=lambda x: (get_category_sort_key(x[0]), x[1]))
+    # Sort by category then by WT: decorate once, sort on plain tuples, undecorate.
+    # The index keeps keys that tie on (category, WT) in their original order.
+    sort_keys = CATEGORY_SORT_KEYS
+    decorated = [(sort_keys.get(key[0], key[0]), key[1], i, key) for i, key in enumerate(all_keys)]
+    decorated.sort()
+    sorted_keys = [item[3] for item in decorated]
     
     # Create comparison rows
     comparison_rows = []
@@ -137,98 +159,100 @@ def create_comparison_file(actuals_file_path, comparison_file_path):
         # Calculate difference (ECC - ECP)
         difference = ecc_amount - ecp_amount
         
-        row = {
-            'pers_no_ecc': pers_no_ecc or '',
-            'pers_no_ecp': pers_no_ecp or '',
-            'name': name or '',
-            'category': category,
-            'wt': wt,
-            'wt_long_text': wt_long_text,
-            'ecc_py_area': ecc.get('py_area', ''),
-            'ecc_for_period': ecc.get('for_period', ''),
-            'ecc_pmt_date': ecc.get('pmt_date', ''),
-            'ecc_number': ecc.get('number', ''),
-            'ecc_amount': format_amount(ecc_amount),
-            'ecp_py_area': ecp.get('py_area', ''),
-            'ecp_for_period': ecp.get('for_period', ''),
-            'ecp_pmt_date': ecp.get('pmt_date', ''),
-            'ecp_number': ecp.get('number', ''),
-            'ecp_amount': format_amount(ecp_amount),
-            'difference': format_amount(difference)
-        }
+        # Fields in output column order (see headers below)
+        row = [
+            pers_no_ecc or '',
+            pers_no_ecp or '',
+            name or '',
+            category,
+            wt,
+            wt_long_text,
+            ecc.get('py_area', ''),
+            ecc.get('for_period', ''),
+            ecc.get('pmt_date', ''),
+            ecc.get('number', ''),
+            format_amount(ecc_amount),
+            ecp.get('py_area', ''),
+            ecp.get('for_period', ''),
+            ecp.get('pmt_date', ''),
+            ecp.get('number', ''),
+            format_amount(ecp_amount),
+            format_amount(difference)
+        ]
         
         comparison_rows.append(row)
     
-    # Write comparison file
+    # Build the comparison file in memory and write it once
+    headers = [
+        'ECC Pers. No',
+        'ECP Pers. No',
+        'Last name First name',
+        'Category',
+        'WT',
+        'Wage Type Long Text',
+        'ECC PY Area, FP',
+        'ECC For-period',
+        'ECC Pmt date',
+        'ECC Number',
+        'ECC Amount',
+        'ECP PY Area, FP',
+        'ECP For-period',
+        'ECP Pmt date',
+        'ECP Number',
+        'ECP Amount',
+        'Difference'
+    ]
+    out = [
+        COMPARISON_RULE,
+        f"COMPARISON DATA - ECP PERNR: {pers_no_ecp or 'N/A'} | ECC PERNR: {pers_no_ecc or 'N/A'}",
+        COMPARISON_RULE,
+        '',
+        '\t'.join(headers),
+        COMPARISON_SEPARATOR
+    ]
+    
+    # Data rows
+    out.extend('\t'.join(row) for row in comparison_rows)
+    
     with open(comparison_file_path, 'w', encoding='utf-8') as f:
-        # Write header
-        f.write('=' * 200 + '\n')
-        f.write(f"COMPARISON DATA - ECP PERNR: {pers_no_ecp or 'N/A'} | ECC PERNR: {pers_no_ecc or 'N/A'}\n")
-        f.write('=' * 200 + '\n')
-        f.write('\n')
-        
-        # Write column headers
-        headers = [
-            'ECC Pers. No',
-            'ECP Pers. No',
-            'Last name First name',
-            'Category',
-            'WT',
-            'Wage Type Long Text',
-            'ECC PY Area, FP',
-            'ECC For-period',
-            'ECC Pmt date',
-            'ECC Number',
-            'ECC Amount',
-            'ECP PY Area, FP',
-            'ECP For-period',
-            'ECP Pmt date',
-            'ECP Number',
-            'ECP Amount',
-            'Difference'
-        ]
-        f.write('\t'.join(headers) + '\n')
-        f.write('-' * 200 + '\n')
-        
-        # Write data rows
-        for row in comparison_rows:
-            line = '\t'.join([
-                row['pers_no_ecc'],
-                row['pers_no_ecp'],
-                row['name'],
-                row['category'],
-                row['wt'],
-                row['wt_long_text'],
-                row['ecc_py_area'],
-                row['ecc_for_period'],
-                row['ecc_pmt_date'],
-                row['ecc_number'],
-                row['ecc_amount'],
-                row['ecp_py_area'],
-                row['ecp_for_period'],
-                row['ecp_pmt_date'],
-                row['ecp_number'],
-                row['ecp_amount'],
-                row['difference']
-            ])
-            f.write(line + '\n')
+        f.write('\n'.join(out) + '\n')
+
+
+def _compare_one(actuals_file, comparison_dir):
+    """
+    Create the comparison file for one actuals file.
+    
+    Returns None on success or the error message, so failures can be
+    counted and reported by the parent process.
+    """
+    try:
+        create_comparison_file(actuals_file, comparison_dir / actuals_file.name)
+        return None
+    except Exception as e:
+        return str(e)
 
 
-def main():
-    """Process all actuals files and create comparison files."""
+def main(actuals_dir=Path('data/actuals'), comparison_dir=Path('data/comparison')):
+    """
+    Process all actuals files and create comparison files.
     
-    # Define paths
-    actuals_dir = Path('data/actuals')
-    comparison_dir = Path('data/comparison')
+    Args:
+        actuals_dir: Directory with the extracted per-user files
+        comparison_dir: Output directory for comparison files
+    """
+    actuals_dir = Path(actuals_dir)
+    comparison_dir = Path(comparison_dir)
     
     # Create comparison directory if it doesn't exist
     comparison_dir.mkdir(parents=True, exist_ok=True)
     
-    # Get all actuals files
-    actuals_files = sorted(actuals_dir.glob('*.txt'))
+    # Get all actuals files (scandir reads names and types in one pass, no globbing)
+    with os.scandir(actuals_dir) as entries:
+        names = sorted(entry.name for entry in entries if entry.name.endswith('.txt') and entry.is_file())
+    actuals_files = [actuals_dir / name for name in names]
     
     if not actuals_files:
-        print("No actuals files found in data/actuals/")
+        print(f"No actuals files found in {actuals_dir}/")
         return
     
     print(f"Processing {len(actuals_files)} actuals files...")
@@ -236,19 +260,20 @@ def main():
     processed = 0
     errors = 0
     
-    for i, actuals_file in enumerate(actuals_files, 1):
-        try:
-            comparison_file = comparison_dir / actuals_file.name
-            create_comparison_file(actuals_file, comparison_file)
-            processed += 1
-            
-            if processed % 5000 == 0:
-                print(f"  Processed {processed}/{len(actuals_files)} files ({processed*100//len(actuals_files)}%)...")
+    # Files are independent: build them across all cores
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_compare_one, actuals_files, repeat(comparison_dir), chunksize=64)
         
-        except Exception as e:
-            if errors < 5:  # Show first 5 errors
-                print(f"Error processing {actuals_file.name}: {e}")
-            errors += 1
+        for actuals_file, error in zip(actuals_files, results):
+            if error is None:
+                processed += 1
+                
+                if processed % 5000 == 0:
+                    print(f"  Processed {processed}/{len(actuals_files)} files ({processed*100//len(actuals_files)}%)...")
+            else:
+                if errors < 5:  # Show first 5 errors
+                    print(f"Error processing {actuals_file.name}: {error}")
+                errors += 1
     
     print(f"\nComparison file generation complete!")
     print(f"  Files created: {processed}")
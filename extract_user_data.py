@@ -12,8 +12,11 @@ This script:
 import csv
 import os
 import re
+import sys
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+
+import create_comparison
 
 # Configuration
 BASE_DIR = Path("/Users/kgt/Desktop/Projects/Opexr/DBCompare/data")
@@ -21,6 +24,7 @@ MAPPING_FILE = BASE_DIR / "realData" / "PERNR_ECC_ECP-Sheet1.csv"
 WAGETYPE_FILE = BASE_DIR / "realData" / "wagetype_classification-Sheet1.csv"
 OUTPUT_DIR = BASE_DIR / "actuals"
 DISCREPANCY_DIR = BASE_DIR / "discrepancies"
+COMPARISON_DIR = BASE_DIR / "comparison"
 
 # ECC and ECP data files
 ECC_FILES = [
@@ -29,6 +33,15 @@ ECC_FILES = [
 ]
 ECP_FILES = ["ECP_1.txt", "ECP_2.txt", "ECP_3.txt", "ECP_4.txt", "ECP_5.txt", "ECP_6.txt", "ECP_7.txt"]
 
+# Banner lines for the output files, built once
+USER_FILE_RULE = "=" * 180
+USER_FILE_SEPARATOR = "-" * 180
+DISCREPANCY_RULE = "=" * 200
+DISCREPANCY_SEPARATOR = "-" * 200
+
+# Chunk size for reading the large ECC/ECP exports as bytes
+INPUT_BUFFER_SIZE = 1 << 22
+
 # Column definitions for ECC and ECP
 # Note: In ECC, "Last name" and "First name" are combined in field 1
 ECC_COLUMNS = {
@@ -64,6 +77,24 @@ EXTRACT_COLUMNS = [
     "Pmt date", "WT", "Wage Type Long Text", "Number", "Amount"
 ]
 
+# ECP names for extract columns that are called differently there
+ECP_COLUMN_ALIASES = {
+    'PY Area, FP': 'PY',
+    'For-period': 'For-pe'
+}
+
+# Source field index for each extract column, resolved once; -1 means not present
+ECC_EXTRACT_IDX = [ECC_COLUMNS.get(col, -1) for col in EXTRACT_COLUMNS]
+ECP_EXTRACT_IDX = [ECP_COLUMNS.get(ECP_COLUMN_ALIASES.get(col, col), -1) for col in EXTRACT_COLUMNS]
+
+# Positions of the validated fields within ParsedLine.values
+WT_POS = EXTRACT_COLUMNS.index('WT')
+LONG_TEXT_POS = EXTRACT_COLUMNS.index('Wage Type Long Text')
+
+# One parsed ECC/ECP line. values holds the EXTRACT_COLUMNS fields in order;
+# category is None when no wage type classification was given.
+ParsedLine = namedtuple('ParsedLine', 'values category is_valid expected_long_text')
+
 
 def load_pernr_mapping():
     """Load ECC to ECP PERNR mapping from CSV."""
@@ -84,27 +115,77 @@ def load_wagetype_classification():
     with open(WAGETYPE_FILE, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            wt = row['WT'].strip()
-            long_text = row['Wage Type Long Text'].strip()
-            category = row['Categories'].strip()
-            wagetype_map[wt] = {
-                'long_text': long_text,
-                'category': category
-            }
+            # Interned so parsed rows share these strings (see parse_*_line)
+            wt = sys.intern(row['WT'].strip())
+            long_text = sys.intern(row['Wage Type Long Text'].strip())
+            category = sys.intern(row['Categories'].strip())
+            # (long text, category): one lookup per parsed line
+            wagetype_map[wt] = (long_text, category)
     print(f"Loaded {len(wagetype_map)} wage type classifications")
     return wagetype_map
 
 
-def extract_pernr_from_line(line):
-    """Extract PERNR (first field) from a data line."""
-    if not line or line.startswith('Pers.No.'):
-        return None
+def iter_matching_lines(filepath, pernrs):
+    """
+    Yield (pernr, line) for data lines whose PERNR is in pernrs.
+    
+    The file is read as bytes in large chunks and only matching lines are
+    decoded, so rows for other employees never pay for UTF-8 decoding.
+    """
+    # Compare PERNRs as bytes, mapping back to the original strings
+    wanted = {pernr.encode('utf-8'): pernr for pernr in pernrs}
+    
+    with open(filepath, 'rb') as f:
+        header_pending = True
+        tail = b''
+        while True:
+            chunk = f.read(INPUT_BUFFER_SIZE)
+            if chunk:
+                # Only split up to the last line break; the rest waits for the
+                # next chunk. Lone \r counts too, as in text mode (\r\n split
+                # across chunks just yields an empty line)
+                cut = max(chunk.rfind(b'\n'), chunk.rfind(b'\r')) + 1
+                if cut == 0:
+                    tail += chunk
+                    continue
+                lines = (tail + chunk[:cut]).splitlines()
+                tail = chunk[cut:]
+            else:
+                lines = tail.splitlines()
+            
+            if header_pending and lines:
+                lines = lines[1:]  # Skip header
+                header_pending = False
+            
+            for line in lines:
+                # PERNR is the first field, separated by whitespace
+                head = line.split(None, 1)
+                if head:
+                    pernr = wanted.get(head[0])
+                    if pernr is not None:
+                        yield pernr, line.decode('utf-8', 'ignore')
+            
+            if not chunk:
+                break
+
+
+def make_parsed_line(values, wagetype_map=None):
+    """Validate extracted column values against the wage type classification."""
+    # WT and long text repeat across millions of rows: keep one copy of each
+    wt = values[WT_POS] = sys.intern(values[WT_POS])
+    long_text = values[LONG_TEXT_POS] = sys.intern(values[LONG_TEXT_POS])
+    values = tuple(values)
+    
+    # Validate wage type if classification is provided
+    if not wagetype_map:
+        return ParsedLine(values, None, True, '')
     
-    # PERNR is the first field, separated by whitespace
-    parts = line.split(None, 1)
-    if parts:
-        return parts[0].strip()
-    return None
+    hit = wagetype_map.get(wt)
+    if hit is not None:
+        expected_long_text, category = hit
+        return ParsedLine(values, category, long_text == expected_long_text, expected_long_text)
+    
+    return ParsedLine(values, 'UNKNOWN', False, 'WT_NOT_FOUND_IN_CLASSIFICATION')
 
 
 def parse_ecc_line(line, wagetype_map=None):
@@ -113,44 +194,13 @@ def parse_ecc_line(line, wagetype_map=None):
         return None
     
     # Split by tab delimiter
-    parts = [p.strip() for p in line.split('\t')]
-    
-    # ECC has 11 fields (index 0-10), pad if necessary
-    while len(parts) < 11:
-        parts.append('')
-    
-    # Extract only the columns we want
-    result = {}
-    for col in EXTRACT_COLUMNS:
-        if col in ECC_COLUMNS:
-            idx = ECC_COLUMNS[col]
-            if idx < len(parts):
-                result[col] = parts[idx]
-            else:
-                result[col] = ''
-        elif col == 'PY Area, FP' and 'PY Area, FP' in ECC_COLUMNS:
-            idx = ECC_COLUMNS['PY Area, FP']
-            result[col] = parts[idx] if idx < len(parts) else ''
-        else:
-            result[col] = ''
+    parts = line.split('\t')
+    n = len(parts)
     
-    # Validate wage type if classification is provided
-    if wagetype_map:
-        wt = result.get('WT', '').strip()
-        long_text = result.get('Wage Type Long Text', '').strip()
-        
-        if wt in wagetype_map:
-            expected_long_text = wagetype_map[wt]['long_text']
-            category = wagetype_map[wt]['category']
-            result['Category'] = category
-            result['Is_Valid'] = (long_text == expected_long_text)
-            result['Expected_Long_Text'] = expected_long_text
-        else:
-            result['Category'] = 'UNKNOWN'
-            result['Is_Valid'] = False
-            result['Expected_Long_Text'] = 'WT_NOT_FOUND_IN_CLASSIFICATION'
+    # Extract only the columns we want; missing trailing fields become ''
+    values = [parts[i].strip() if 0 <= i < n else '' for i in ECC_EXTRACT_IDX]
     
-    return result
+    return make_parsed_line(values, wagetype_map)
 
 
 def parse_ecp_line(line, wagetype_map=None):
@@ -159,47 +209,13 @@ def parse_ecp_line(line, wagetype_map=None):
         return None
     
     # Split by tab delimiter
-    parts = [p.strip() for p in line.split('\t')]
-    
-    # ECP has 9 fields (index 0-8), pad if necessary
-    while len(parts) < 9:
-        parts.append('')
-    
-    # Extract only the columns we want, handling column name differences
-    result = {}
-    for col in EXTRACT_COLUMNS:
-        if col == 'PY Area, FP':
-            # Map to PY column in ECP
-            result[col] = parts[ECP_COLUMNS['PY']] if ECP_COLUMNS['PY'] < len(parts) else ''
-        elif col == 'For-period':
-            # Map to For-pe column in ECP
-            result[col] = parts[ECP_COLUMNS['For-pe']] if ECP_COLUMNS['For-pe'] < len(parts) else ''
-        elif col in ECP_COLUMNS:
-            idx = ECP_COLUMNS[col]
-            if idx < len(parts):
-                result[col] = parts[idx]
-            else:
-                result[col] = ''
-        else:
-            result[col] = ''
+    parts = line.split('\t')
+    n = len(parts)
     
-    # Validate wage type if classification is provided
-    if wagetype_map:
-        wt = result.get('WT', '').strip()
-        long_text = result.get('Wage Type Long Text', '').strip()
-        
-        if wt in wagetype_map:
-            expected_long_text = wagetype_map[wt]['long_text']
-            category = wagetype_map[wt]['category']
-            result['Category'] = category
-            result['Is_Valid'] = (long_text == expected_long_text)
-            result['Expected_Long_Text'] = expected_long_text
-        else:
-            result['Category'] = 'UNKNOWN'
-            result['Is_Valid'] = False
-            result['Expected_Long_Text'] = 'WT_NOT_FOUND_IN_CLASSIFICATION'
+    # Extract only the columns we want (ECP names resolved via ECP_COLUMN_ALIASES)
+    values = [parts[i].strip() if 0 <= i < n else '' for i in ECP_EXTRACT_IDX]
     
-    return result
+    return make_parsed_line(values, wagetype_map)
 
 
 def process_ecc_files(ecc_pernrs, data_dir, wagetype_map=None):
@@ -213,15 +229,10 @@ def process_ecc_files(ecc_pernrs, data_dir, wagetype_map=None):
             continue
         
         print(f"Processing {filename}...")
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            header = f.readline()  # Skip header
-            
-            for line in f:
-                pernr = extract_pernr_from_line(line)
-                if pernr and pernr in ecc_pernrs:
-                    parsed = parse_ecc_line(line, wagetype_map)
-                    if parsed:
-                        ecc_data[pernr].append(parsed)
+        for pernr, line in iter_matching_lines(filepath, ecc_pernrs):
+            parsed = parse_ecc_line(line, wagetype_map)
+            if parsed:
+                ecc_data[pernr].append(parsed)
     
     return ecc_data
 
@@ -237,38 +248,39 @@ def process_ecp_files(ecp_pernrs, data_dir, wagetype_map=None):
             continue
         
         print(f"Processing {filename}...")
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            header = f.readline()  # Skip header
-            
-            for line in f:
-                pernr = extract_pernr_from_line(line)
-                if pernr and pernr in ecp_pernrs:
-                    parsed = parse_ecp_line(line, wagetype_map)
-                    if parsed:
-                        ecp_data[pernr].append(parsed)
+        for pernr, line in iter_matching_lines(filepath, ecp_pernrs):
+            parsed = parse_ecp_line(line, wagetype_map)
+            if parsed:
+                ecp_data[pernr].append(parsed)
     
     return ecp_data
 
 
 def sort_lines_by_category_and_wt(lines):
     """Sort lines by category (UNKNOWN at end) and then by WT."""
-    def sort_key(line):
-        category = line.get('Category', 'UNKNOWN')
-        wt = line.get('WT', '')
+    # Decorate once and sort on plain tuples; the index keeps ties stable
+    # and stops the comparison from ever reaching the line dicts
+    decorated = []
+    for i, line in enumerate(lines):
+        category = line.category
         
-        # Put UNKNOWN category at the end
-        if category == 'UNKNOWN':
-            category_order = 'ZZZZ_UNKNOWN'  # Ensures it sorts last
-        else:
-            category_order = category
+        # Put UNKNOWN (or unclassified) category at the end
+        if category is None or category == 'UNKNOWN':
+            category = 'ZZZZ_UNKNOWN'  # Ensures it sorts last
         
-        return (category_order, wt)
+        decorated.append((category, line.values[WT_POS], i, line))
     
-    return sorted(lines, key=sort_key)
+    decorated.sort()
+    return [item[3] for item in decorated]
 
 
-def write_user_file(ecp_pernr, ecc_pernr, ecc_lines, ecp_lines, output_dir):
-    """Write combined ECC and ECP data to a file named with ECP PERNR."""
+def write_user_file(ecp_pernr, ecc_pernr, ecc_lines, ecp_lines, output_dir, comparison_dir=None):
+    """
+    Write combined ECC and ECP data to a file named with ECP PERNR.
+    
+    If comparison_dir is given, the comparison file is built from the same
+    in-memory rows, without reading the actuals file back.
+    """
     output_file = output_dir / f"{ecp_pernr}.txt"
     
     # Sort lines by category and wage type
@@ -276,84 +288,82 @@ def write_user_file(ecp_pernr, ecc_pernr, ecc_lines, ecp_lines, output_dir):
     ecp_lines_sorted = sort_lines_by_category_and_wt(ecp_lines)
     
     # Count valid and invalid entries
-    ecc_valid = sum(1 for line in ecc_lines if line.get('Is_Valid', True))
+    ecc_valid = sum(1 for line in ecc_lines if line.is_valid)
     ecc_invalid = len(ecc_lines) - ecc_valid
-    ecp_valid = sum(1 for line in ecp_lines if line.get('Is_Valid', True))
+    ecp_valid = sum(1 for line in ecp_lines if line.is_valid)
     ecp_invalid = len(ecp_lines) - ecp_valid
     
+    # Build the whole file in memory and write it once
+    out = [
+        USER_FILE_RULE,
+        f"COMBINED USER DATA - ECP PERNR: {ecp_pernr} | ECC PERNR: {ecc_pernr}",
+        f"ECC Entries: {len(ecc_lines)} (Valid: {ecc_valid}, Invalid: {ecc_invalid}) | "
+        f"ECP Entries: {len(ecp_lines)} (Valid: {ecp_valid}, Invalid: {ecp_invalid})",
+        USER_FILE_RULE,
+        "",
+        # Combined header with system suffixes and selected columns plus Category
+        "System\t" + "\t".join(EXTRACT_COLUMNS) + "\tCategory",
+        USER_FILE_SEPARATOR
+    ]
+    
+    # ECC data with ECC prefix, then ECP data with ECP prefix (both sorted)
+    rows = []
+    for system, lines_sorted in (("ECC", ecc_lines_sorted), ("ECP", ecp_lines_sorted)):
+        for line_data in lines_sorted:
+            row = [system, *line_data.values, line_data.category or '']
+            rows.append(row)
+            out.append("\t".join(row))
+    
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 180 + "\n")
-        f.write(f"COMBINED USER DATA - ECP PERNR: {ecp_pernr} | ECC PERNR: {ecc_pernr}\n")
-        f.write(f"ECC Entries: {len(ecc_lines)} (Valid: {ecc_valid}, Invalid: {ecc_invalid}) | ")
-        f.write(f"ECP Entries: {len(ecp_lines)} (Valid: {ecp_valid}, Invalid: {ecp_invalid})\n")
-        f.write("=" * 180 + "\n\n")
-        
-        # Write combined header with system suffixes and selected columns plus Category
-        header_line = "System\t" + "\t".join(EXTRACT_COLUMNS) + "\tCategory"
-        f.write(header_line + "\n")
-        f.write("-" * 180 + "\n")
-        
-        # Write ECC data with ECC prefix (sorted)
-        for line_data in ecc_lines_sorted:
-            row = ["ECC"] + [line_data.get(col, '') for col in EXTRACT_COLUMNS] + [line_data.get('Category', '')]
-            f.write("\t".join(row) + "\n")
-        
-        # Write ECP data with ECP prefix (sorted)
-        for line_data in ecp_lines_sorted:
-            row = ["ECP"] + [line_data.get(col, '') for col in EXTRACT_COLUMNS] + [line_data.get('Category', '')]
-            f.write("\t".join(row) + "\n")
+        f.write("\n".join(out) + "\n")
+    
+    if comparison_dir is not None:
+        create_comparison.create_comparison_from_rows(rows, comparison_dir / output_file.name)
     
     return output_file
 
 
 def write_discrepancy_files(ecp_pernr, ecc_pernr, ecc_lines, ecp_lines, discrepancy_dir):
     """Write discrepancy files for entries that don't match wage type classification."""
-    ecc_invalid = [line for line in ecc_lines if not line.get('Is_Valid', True)]
-    ecp_invalid = [line for line in ecp_lines if not line.get('Is_Valid', True)]
+    ecc_invalid = [line for line in ecc_lines if not line.is_valid]
+    ecp_invalid = [line for line in ecp_lines if not line.is_valid]
     
     if not ecc_invalid and not ecp_invalid:
         return None
     
     output_file = discrepancy_dir / f"{ecp_pernr}_discrepancies.txt"
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 200 + "\n")
-        f.write(f"WAGE TYPE DISCREPANCIES - ECP PERNR: {ecp_pernr} | ECC PERNR: {ecc_pernr}\n")
-        f.write(f"ECC Discrepancies: {len(ecc_invalid)} | ECP Discrepancies: {len(ecp_invalid)}\n")
-        f.write("=" * 200 + "\n\n")
+    # Build the whole file in memory and write it once
+    out = [
+        DISCREPANCY_RULE,
+        f"WAGE TYPE DISCREPANCIES - ECP PERNR: {ecp_pernr} | ECC PERNR: {ecc_pernr}",
+        f"ECC Discrepancies: {len(ecc_invalid)} | ECP Discrepancies: {len(ecp_invalid)}",
+        DISCREPANCY_RULE,
+        ""
+    ]
+    header_line = "System\t" + "\t".join(EXTRACT_COLUMNS) + "\tCategory\tExpected Long Text\tIssue"
+    
+    for system, invalid in (("ECC", ecc_invalid), ("ECP", ecp_invalid)):
+        if not invalid:
+            continue
         
-        if ecc_invalid:
-            f.write("--- ECC DISCREPANCIES ---\n")
-            header_line = "System\t" + "\t".join(EXTRACT_COLUMNS) + "\tCategory\tExpected Long Text\tIssue"
-            f.write(header_line + "\n")
-            f.write("-" * 200 + "\n")
-            
-            for line_data in ecc_invalid:
-                actual_long_text = line_data.get('Wage Type Long Text', '')
-                expected_long_text = line_data.get('Expected_Long_Text', '')
-                issue = "WT not in classification" if expected_long_text == "WT_NOT_FOUND_IN_CLASSIFICATION" else "Long text mismatch"
-                
-                row = (["ECC"] + 
-                       [line_data.get(col, '') for col in EXTRACT_COLUMNS] + 
-                       [line_data.get('Category', ''), expected_long_text, issue])
-                f.write("\t".join(row) + "\n")
-            f.write("\n")
+        out.append(f"--- {system} DISCREPANCIES ---")
+        out.append(header_line)
+        out.append(DISCREPANCY_SEPARATOR)
         
-        if ecp_invalid:
-            f.write("--- ECP DISCREPANCIES ---\n")
-            header_line = "System\t" + "\t".join(EXTRACT_COLUMNS) + "\tCategory\tExpected Long Text\tIssue"
-            f.write(header_line + "\n")
-            f.write("-" * 200 + "\n")
+        for line_data in invalid:
+            expected_long_text = line_data.expected_long_text
+            issue = "WT not in classification" if expected_long_text == "WT_NOT_FOUND_IN_CLASSIFICATION" else "Long text mismatch"
             
-            for line_data in ecp_invalid:
-                actual_long_text = line_data.get('Wage Type Long Text', '')
-                expected_long_text = line_data.get('Expected_Long_Text', '')
-                issue = "WT not in classification" if expected_long_text == "WT_NOT_FOUND_IN_CLASSIFICATION" else "Long text mismatch"
-                
-                row = (["ECP"] + 
-                       [line_data.get(col, '') for col in EXTRACT_COLUMNS] + 
-                       [line_data.get('Category', ''), expected_long_text, issue])
-                f.write("\t".join(row) + "\n")
+            row = [system, *line_data.values, line_data.category or '', expected_long_text, issue]
+            out.append("\t".join(row))
+        
+        # Blank line between the ECC and ECP sections
+        if system == "ECC":
+            out.append("")
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("\n".join(out) + "\n")
     
     return output_file
 
@@ -362,6 +372,7 @@ def main():
     # Ensure output directories exist
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     DISCREPANCY_DIR.mkdir(parents=True, exist_ok=True)
+    COMPARISON_DIR.mkdir(parents=True, exist_ok=True)
     
     # Step 1: Load PERNR mapping
     print("Step 1: Loading PERNR mapping...")
@@ -387,7 +398,7 @@ def main():
     ecp_data = process_ecp_files(ecp_pernrs, data_dir, wagetype_map)
     print(f"Found ECP data for {len(ecp_data)} users")
     
-    # Step 5: Write combined files and discrepancy files
+    # Step 5: Write combined, comparison and discrepancy files
     print("\nStep 5: Writing output files...")
     files_created = 0
     files_skipped = 0
@@ -401,15 +412,15 @@ def main():
         
         # Only create file if we have data from at least one system
         if ecc_lines or ecp_lines:
-            output_file = write_user_file(ecp_pernr, ecc_pernr, ecc_lines, ecp_lines, OUTPUT_DIR)
+            output_file = write_user_file(ecp_pernr, ecc_pernr, ecc_lines, ecp_lines, OUTPUT_DIR, COMPARISON_DIR)
             files_created += 1
             
             # Write discrepancy file if there are any invalid entries
             discrepancy_file = write_discrepancy_files(ecp_pernr, ecc_pernr, ecc_lines, ecp_lines, DISCREPANCY_DIR)
             if discrepancy_file:
                 discrepancy_files_created += 1
-                ecc_invalid_count = sum(1 for line in ecc_lines if not line.get('Is_Valid', True))
-                ecp_invalid_count = sum(1 for line in ecp_lines if not line.get('Is_Valid', True))
+                ecc_invalid_count = sum(1 for line in ecc_lines if not line.is_valid)
+                ecp_invalid_count = sum(1 for line in ecp_lines if not line.is_valid)
                 total_ecc_discrepancies += ecc_invalid_count
                 total_ecp_discrepancies += ecp_invalid_count
                 
@@ -424,41 +435,15 @@ def main():
     print(f"\n{'=' * 80}")
     print(f"SUMMARY:")
     print(f"  Total mappings: {len(pernr_mapping)}")
-    print(f"  Files created: {files_created}")
+    print(f"  Files created: {files_created} (plus one comparison file each)")
     print(f"  Files skipped (no data): {files_skipped}")
     print(f"  Discrepancy files created: {discrepancy_files_created}")
     print(f"  Total ECC discrepancies: {total_ecc_discrepancies}")
     print(f"  Total ECP discrepancies: {total_ecp_discrepancies}")
     print(f"  Output directory: {OUTPUT_DIR}")
+    print(f"  Comparison directory: {COMPARISON_DIR}")
     print(f"  Discrepancy directory: {DISCREPANCY_DIR}")
     print(f"{'=' * 80}")
-    
-    # Generate comparison files
-    print(f"\n{'=' * 80}")
-    print("GENERATING COMPARISON FILES...")
-    print(f"{'=' * 80}")
-    
-    try:
-        import subprocess
-        result = subprocess.run(
-            ["python3", "create_comparison.py"],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent
-        )
-        
-        # Print output from comparison script
-        if result.stdout:
-            print(result.stdout)
-        
-        if result.stderr:
-            print("Errors:", result.stderr)
-        
-        if result.returncode != 0:
-            print(f"Warning: Comparison script exited with code {result.returncode}")
-    
-    except Exception as e:
-        print(f"Error running comparison script: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+"""
+Test cases for the comparison-to-JSON converter.
+"""
+import pytest
+
+from convert_to_json import parse_amount
+
+
+@pytest.mark.parametrize("amount_str, expected", [
+    ("1,234.50", 1234.5),
+    ("2,200.00-", -2200.0),
+    ("15", 15.0),
+    ("", None),
+    ("   ", None),
+    (",", None),
+    (",,-", None),
+    ("-", None),
+    ("abc", None),
+])
+def test_parse_amount(amount_str, expected):
+    """Test amount parsing, including inputs that are empty once commas are removed."""
+    assert parse_amount(amount_str) == expected
@@ -0,0 +1,20 @@
+"""
+Test cases for the ECC/ECP user data extraction.
+"""
+import pytest
+
+import extract_user_data
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("buffer_size", [3, 1 << 22])
+def test_iter_matching_lines_line_endings(tmp_path, monkeypatch, newline, buffer_size):
+    """Test that every line ending style yields the same rows, across chunk boundaries."""
+    rows = ["Pers.No.\tName", "100\tDoe John", "200\tRoe Jane", "100\tDoe John 2"]
+    export = tmp_path / "export.txt"
+    export.write_bytes((newline.join(rows) + newline).encode("utf-8"))
+    monkeypatch.setattr(extract_user_data, "INPUT_BUFFER_SIZE", buffer_size)
+    
+    matches = list(extract_user_data.iter_matching_lines(export, {"100"}))
+    
+    assert matches == [("100", "100\tDoe John"), ("100", "100\tDoe John 2")]